@@ -1,24 +1,62 @@
+import os
+import sys
+
 import dash
 from dash import html, dcc
 
-app = dash.Dash(__name__, use_pages=True)
-server = app.server
-app.layout = html.Div([
-    html.Link(
-        rel='stylesheet',
-        href='https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css'
-    ),
-    
-    html.H1("Técnicas de Modelamiento Matemático", className='app-header'),
-    html.Div([
+from simulacion import estaticos, metricas, transporte
+from simulacion.arranque import Arranque, precargar
+from simulacion.trabajos import administrador, cache_trabajos
+
+
+def crear_app(precarga=False):
+    app = dash.Dash(
+        __name__,
+        use_pages=True,
+        background_callback_manager=administrador,
+        compress=False,
+    )
+    # Primero transporte: Flask corre los after_request en orden inverso, así
+    # las métricas miden el JSON antes de comprimirlo.
+    transporte.instalar(app)
+    metricas.instalar(app.server)
+    estaticos.instalar(app)
+
+    app.layout = html.Div([
+        None if transporte.ICONOS_LOCALES else html.Link(
+            rel='stylesheet',
+            href=f'{transporte.ICONOS_CDN}/css/all.min.css'
+        ),
+
+        html.H1("Técnicas de Modelamiento Matemático", className='app-header'),
         html.Div([
-            html.Div(
-                dcc.Link(f"{page['name']}", href=page["relative_path"], className='nav-link'),
-            ) for page in dash.page_registry.values()
-        ], className='nav-links')
-    ], className='navigation'),
-    dash.page_container
-], className='app-container')
+            html.Div([
+                html.Div(
+                    dcc.Link(f"{page['name']}", href=page["relative_path"], className='nav-link'),
+                ) for page in dash.page_registry.values()
+            ], className='nav-links')
+        ], className='navigation'),
+        dash.page_container,
+        metricas.panel() if os.environ.get('SIMULACION_PANEL_METRICAS') == '1' else None,
+    ], className='app-container')
+
+    if precarga:
+        precargar()
+
+    metricas.registro.arranque = Arranque().terminar()
+    print(metricas.registro.arranque.reporte(len(dash.page_registry)), file=sys.stderr)
+    return app
+
+
+def iniciar_worker():
+    # gunicorn lo llama en cada worker recién bifurcado. La conexión sqlite
+    # de diskcache que abrió el maestro no puede compartirse entre procesos;
+    # al cerrarla, cada worker abre la suya en el primer uso.
+    cache_trabajos.close()
+
+
+app = crear_app(precarga=os.environ.get('SIMULACION_PRECARGA') == '1')
+server = app.server
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
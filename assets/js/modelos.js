@@ -0,0 +1,33 @@
+// Modelos con solución cerrada que se evalúan en el navegador. Si los
+// parámetros no permiten evaluarlos (campo vacío, resultado no finito) se
+// escribe en el Store de respaldo y el servidor responde con un mensaje.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    modelos: {
+        logistico: function(n_clicks, P0, K, r, t_max, figura) {
+            const sinCambio = window.dash_clientside.no_update;
+            const parametros = [P0, K, r, t_max];
+            if (!figura || !(figura.data || []).length || !parametros.every(v => typeof v === 'number' && isFinite(v))) {
+                return [sinCambio, n_clicks, sinCambio];
+            }
+
+            const n = 50;
+            const t = new Array(n);
+            const P = new Array(n);
+            for (let i = 0; i < n; i++) {
+                t[i] = t_max * i / (n - 1);
+                // P = 0 es un equilibrio; la fórmula cerrada divide por P0.
+                P[i] = P0 === 0 ? 0 : K / (1 + ((K - P0) / P0) * Math.exp(-r * t[i]));
+            }
+            if (!P.every(isFinite)) {
+                return [sinCambio, n_clicks, sinCambio];
+            }
+
+            const traza = Object.assign({}, figura.data[0], {
+                x: t,
+                y: P,
+                name: `P(t) = ${K} / (1 + ((${K} - ${P0})/${P0})e^(-${r}t))`
+            });
+            return [Object.assign({}, figura, {data: [traza]}), sinCambio, ''];
+        }
+    }
+});
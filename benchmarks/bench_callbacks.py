@@ -0,0 +1,119 @@
+from functools import partial
+
+import pytest
+
+# Cada caso son los valores de los campos. Sin figura en el navegador se
+# arma la figura completa; con las trazas ya dibujadas se envía un Patch.
+
+CASOS_SIR = {
+    'tipico': (1000, 0.3, 0.1, 1, 100),
+    'extremo': (1_000_000, 5.0, 0.01, 1, 10_000),
+}
+
+CASOS_SEIR = {
+    'tipico': (1000, 0.5, 0.2, 0.1, 1, 100),
+    'extremo': (1_000_000, 5.0, 0.01, 0.01, 1, 10_000),
+}
+
+CASOS_GILPIN = {
+    'tipico': (0.25, 10, 0.5, 0.33, 0.2, 3.5, 0.1, 4, 1, 250),
+    'extremo': (0.25, 10, 0.5, 0.33, 0.2, 3.5, 0.1, 4, 1, 10_000),
+}
+
+CASOS_IMPULSIVO = {
+    'tipico': (0.25, 10, 0.5, 0.33, 0.2, 3.5, 0.1, 0.5, 1.5, 0.8, 0.7, 0.3, 0.0, 4, 1, 200),
+    'extremo': (0.25, 10, 0.5, 0.33, 0.2, 3.5, 0.1, 0.5, 1.5, 0.8, 0.7, 0.3, 0.0, 4, 1, 5_000),
+}
+
+CASOS_CAMPO = {
+    'n15': 15,
+    'n100': 100,
+    'n200': 200,
+}
+
+RENDER = ['completo', 'parche']
+
+# Modo en vivo: vista previa con tolerancias flojas contra el refinamiento.
+ETAPAS = {'previa': True, 'refinada': False}
+
+
+def sin_progreso(*args):
+    pass
+
+
+def actual(render, *esqueletos):
+    # Lo que el navegador devuelve como State de cada gráfica.
+    return [{'data': e.trazas} if render == 'parche' else None for e in esqueletos]
+
+
+@pytest.mark.parametrize('render', RENDER)
+@pytest.mark.parametrize('caso', CASOS_SIR)
+def bench_simular_sir(paginas, medir, caso, render):
+    pagina = paginas['modelosir']
+    medir(pagina.simular_sir, 1, *CASOS_SIR[caso], *actual(render, pagina.esqueleto_sir))
+
+
+@pytest.mark.parametrize('render', RENDER)
+@pytest.mark.parametrize('caso', CASOS_SEIR)
+def bench_simular_seir(paginas, medir, caso, render):
+    pagina = paginas['modeloseir']
+    medir(pagina.simular_seir, 1, *CASOS_SEIR[caso], *actual(render, pagina.esqueleto_seir))
+
+
+@pytest.mark.parametrize('render', RENDER)
+@pytest.mark.parametrize('caso', CASOS_GILPIN)
+def bench_simular_poblaciones(paginas, medir, caso, render):
+    pagina = paginas['depredadorpresa1']
+    medir(pagina.simular_poblaciones, 1, *CASOS_GILPIN[caso],
+          *actual(render, pagina.esqueleto_tiempo, pagina.esqueleto_fase))
+
+
+@pytest.mark.parametrize('etapa', ETAPAS)
+@pytest.mark.parametrize('caso', CASOS_SIR)
+def bench_vivo_sir(paginas, medir, caso, etapa):
+    pagina = paginas['modelosir']
+    medir(partial(pagina.graficar_sir, previa=ETAPAS[etapa]),
+          *actual('parche', pagina.esqueleto_sir), *CASOS_SIR[caso])
+
+
+@pytest.mark.parametrize('etapa', ETAPAS)
+@pytest.mark.parametrize('caso', CASOS_SEIR)
+def bench_vivo_seir(paginas, medir, caso, etapa):
+    pagina = paginas['modeloseir']
+    medir(partial(pagina.graficar_seir, previa=ETAPAS[etapa]),
+          *actual('parche', pagina.esqueleto_seir), *CASOS_SEIR[caso])
+
+
+@pytest.mark.parametrize('etapa', ETAPAS)
+@pytest.mark.parametrize('caso', CASOS_GILPIN)
+def bench_vivo_poblaciones(paginas, medir, caso, etapa):
+    pagina = paginas['depredadorpresa1']
+    medir(partial(pagina.graficar_poblaciones, previa=ETAPAS[etapa]),
+          actual('parche', pagina.esqueleto_tiempo, pagina.esqueleto_fase), *CASOS_GILPIN[caso])
+
+
+@pytest.mark.parametrize('render', RENDER)
+@pytest.mark.parametrize('caso', CASOS_IMPULSIVO)
+def bench_simular_sistema_hibrido(paginas, medir, caso, render):
+    pagina = paginas['depredadorpresa2']
+    medir(pagina.simular_sistema_hibrido, sin_progreso, 1, *CASOS_IMPULSIVO[caso],
+          *actual(render, pagina.esqueleto_tiempo, pagina.esqueleto_fase))
+
+
+@pytest.mark.parametrize('opciones', [[], ['normalizar', 'colorear']], ids=['simple', 'color'])
+@pytest.mark.parametrize('caso', CASOS_CAMPO)
+def bench_graficar_campo(paginas, medir, caso, opciones):
+    medir(
+        paginas['campovectorial'].graficar_campo,
+        sin_progreso, 1, 'Y*np.sin(X) - X*np.cos(Y)', 'X*np.sin(Y) + Y*np.cos(X)', 5, 5, CASOS_CAMPO[caso], opciones
+    )
+
+
+@pytest.mark.parametrize('render', RENDER)
+def bench_actualizar_grafica(paginas, medir, render):
+    pagina = paginas['pagina3']
+    medir(pagina.actualizar_grafica, 1, 100, 1000, 0.3, 50, *actual(render, pagina.esqueleto_logistico))
+
+
+def bench_pract1_layout(paginas, medir):
+    medir(paginas['pract1'].layout)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from conftest import tamano_json
+
+
+@pytest.fixture(scope='module')
+def sir(paginas):
+    return paginas['modelosir']
+
+
+def bench_resolver_sir(sir, benchmark):
+    # __wrapped__ salta el cache de simulaciones: mide solo la integración.
+    benchmark(sir.resolver_sir.__wrapped__, 1000, 0.3, 0.1, 1, 100)
+
+
+def bench_figura_sir(sir, benchmark):
+    t, (S, I, R) = sir.resolver_sir.__wrapped__(1000, 0.3, 0.1, 1, 100)
+    datos = (dict(x=t, y=S), dict(x=t, y=I), dict(x=t, y=R))
+    fig = benchmark(sir.esqueleto_sir.figura, *datos)
+    benchmark.extra_info['json_bytes'] = tamano_json(fig)
+
+
+def bench_serializar_sir(sir, benchmark):
+    t, (S, I, R) = sir.resolver_sir.__wrapped__(1000, 0.3, 0.1, 1, 100)
+    fig = sir.esqueleto_sir.figura(dict(x=t, y=S), dict(x=t, y=I), dict(x=t, y=R))
+    benchmark(tamano_json, fig)
+
+
+@pytest.mark.parametrize('compilado', [False, True], ids=['python', 'nucleo'])
+def bench_rhs_gilpin(paginas, benchmark, compilado):
+    # Compara el RHS de referencia con el núcleo de simulacion.nucleos (que
+    # solo difiere si numba está instalado).
+    from simulacion.muestreo import integrar_adaptativo
+    from simulacion.nucleos import nucleo
+
+    referencia = paginas['depredadorpresa1'].modelo_rumor
+    rhs = nucleo('gilpin-ayala', referencia) if compilado else referencia
+    args = (0.25, 10, 0.5, 0.33, 0.2, 3.5, 0.1)
+    benchmark(integrar_adaptativo, rhs, np.array([4.0, 1.0]), 2000, args)
+
+
+@pytest.mark.parametrize('n', [20, 200])
+def bench_barrido_sir(benchmark, n):
+    from simulacion.barrido import evaluar_bloque
+
+    betas, gammas = np.meshgrid(np.linspace(0.05, 1, n), np.linspace(0.02, 0.5, n))
+    fijos = {'N': 1000, 'I0': 1, 't_max': 100}
+    benchmark(evaluar_bloque, 'sir', betas.ravel(), gammas.ravel(), fijos)
+
+
+@pytest.mark.parametrize('args', [
+    (0.25, 10, 0.5, 0.33, 0.2, 3.5, 0.1),
+    (0.25, 1000, 2.0, 0.33, 0.2, 3.5, 0.15),
+], ids=['foco-estable', 'foco-inestable'])
+def bench_analizar_gilpin(paginas, benchmark, args):
+    # Equilibrios, autovalores y (en el segundo caso) búsqueda del ciclo
+    # límite; el objetivo es quedar por debajo de 50 ms por combinación.
+    benchmark(paginas['depredadorpresa1'].analizar_gilpin.__wrapped__, *args)
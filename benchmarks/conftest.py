@@ -0,0 +1,51 @@
+import os
+import sys
+import tracemalloc
+
+import pytest
+from plotly.io.json import to_json_plotly
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for ruta in (RAIZ, os.path.join(RAIZ, 'tests')):
+    if ruta not in sys.path:
+        sys.path.insert(0, ruta)
+
+from paginas import paginas  # noqa: E402,F401
+
+
+def _plano(salida):
+    if hasattr(salida, 'to_plotly_json'):
+        return salida.to_plotly_json()
+    return salida
+
+
+def tamano_json(salida):
+    salidas = salida if isinstance(salida, (tuple, list)) else (salida,)
+    return sum(len(to_json_plotly(_plano(s))) for s in salidas)
+
+
+def memoria_pico(funcion, *args):
+    tracemalloc.start()
+    try:
+        funcion(*args)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pico
+
+
+@pytest.fixture
+def medir(benchmark):
+    # Ejecuta la función en frío (cache de simulaciones vacío) y guarda en
+    # extra_info el tamaño del JSON de respuesta y el pico de memoria.
+    from simulacion.cache import cache
+
+    def ejecutar(funcion, *args, rondas=5):
+        salida = benchmark.pedantic(funcion, args=args, setup=cache.limpiar,
+                                    rounds=rondas, iterations=1)
+        cache.limpiar()
+        benchmark.extra_info['json_bytes'] = tamano_json(salida)
+        benchmark.extra_info['memoria_pico_bytes'] = memoria_pico(funcion, *args)
+        return salida
+
+    return ejecutar
@@ -0,0 +1,45 @@
+import gc
+import multiprocessing
+import os
+
+# gunicorn lee este archivo antes de cargar la app (con preload_app la carga
+# ocurre al crear el Arbiter, antes de on_starting): sin recolecciones
+# mientras se importa todo, para no dejar huecos en páginas de memoria que
+# luego se compartirán. when_ready lo vuelve a activar.
+gc.disable()
+
+# Con preload_app el maestro importa app.py (numpy, scipy, plotly, las
+# páginas y sus callbacks) una sola vez y los workers lo heredan por
+# copy-on-write.
+os.environ.setdefault('SIMULACION_PRECARGA', '1')
+
+# Cada worker ya es un proceso; BLAS con varios hilos por worker solo
+# compite por los mismos núcleos.
+for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(variable, '1')
+
+wsgi_app = 'app:server'
+bind = f"0.0.0.0:{os.environ.get('PORT', 8050)}"
+preload_app = True
+
+# Las simulaciones usan CPU y retienen el GIL: un worker por núcleo y unos
+# pocos hilos para las peticiones cortas (páginas, progreso, /metrics).
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+
+def when_ready(server):
+    # Corre una vez, con la app ya cargada y antes del primer fork. Mueve
+    # todo lo importado a la generación permanente: el recolector de los
+    # workers (y de los que se relancen) no lo recorre ni copia esas páginas.
+    gc.freeze()
+    gc.enable()
+
+
+def post_fork(server, worker):
+    from app import iniciar_worker
+    iniciar_worker()
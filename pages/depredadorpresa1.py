@@ -1,8 +1,16 @@
 import dash
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, Input, Output, State
 import numpy as np
 import plotly.graph_objs as go
-from scipy.integrate import odeint
+from simulacion.cache import memorizar
+from simulacion.equilibrios import analizar, malla_semillas
+from simulacion.figuras import Esqueleto, PLANTILLA_POBLACIONES
+from simulacion.metricas import callback
+from simulacion.muestreo import integrar_adaptativo
+from simulacion.nucleos import nucleo
+from simulacion.solucionador import ErrorSimulacion
+from simulacion.validacion import revisar
+from simulacion.vivo import OPCIONES_PREVIA, coalescedor, deslizador, modo_vivo
 
 dash.register_page(__name__, path='/pagina9', name='Gilpin-Ayala',order=6)
 
@@ -12,56 +20,59 @@ layout = html.Div([
 
         html.Div([
             html.Label("Tasa intrínseca de crecimiento de la presa (r): "),
-            dcc.Input(id='input-r', type='number', value=0.25, step=0.01, className="input-field"),
+            deslizador('input-r', 0.01, 1.0, 0.01, 0.25),
         ], className="input-group"),
 
         html.Div([
             html.Label("Capacidad de carga ambiental de la presa (K): "),
-            dcc.Input(id='input-K', type='number', value=10, className="input-field"),
+            dcc.Input(id='input-K', type='number', value=10, debounce=True, className="input-field"),
         ], className="input-group"),
 
         html.Div([
             html.Label("Exponente de Gilpin-Ayala (α): "),
-            dcc.Input(id='input-alpha', type='number', value=0.5, step=0.01, className="input-field"),
+            deslizador('input-alpha', 0.05, 2.0, 0.05, 0.5),
         ], className="input-group"),
 
         html.Div([
             html.Label("Tasa de captura del depredador (τ1): "),
-            dcc.Input(id='input-tau1', type='number', value=0.33, step=0.01, className="input-field"),
+            deslizador('input-tau1', 0.01, 1.0, 0.01, 0.33),
         ], className="input-group"),
 
         html.Div([
             html.Label("Coeficiente de conversión de presa a nuevos depredadores (τ2): "),
-            dcc.Input(id='input-tau2', type='number', value=0.2, step=0.01, className="input-field"),
+            deslizador('input-tau2', 0.01, 1.0, 0.01, 0.2),
         ], className="input-group"),
 
         html.Div([
             html.Label("Constante de semi-saturación (β): "),
-            dcc.Input(id='input-beta', type='number', value=3.5, step=0.1, className="input-field"),
+            deslizador('input-beta', 0.1, 10.0, 0.1, 3.5),
         ], className="input-group"),
 
         html.Div([
             html.Label("Tasa de mortalidad natural del depredador (ω): "),
-            dcc.Input(id='input-omega', type='number', value=0.1, step=0.01, className="input-field"),
+            deslizador('input-omega', 0.01, 1.0, 0.01, 0.1),
         ], className="input-group"),
 
         html.Div([
             html.Label("Presas iniciales (A0): "),
-            dcc.Input(id='input-A0', type='number', value=4, className="input-field"),
+            dcc.Input(id='input-A0', type='number', value=4, debounce=True, className="input-field"),
         ], className="input-group"),
 
         html.Div([
             html.Label("Depredadores iniciales (B0): "),
-            dcc.Input(id='input-B0', type='number', value=1, className="input-field"),
+            dcc.Input(id='input-B0', type='number', value=1, debounce=True, className="input-field"),
         ], className="input-group"),
 
         html.Div([
             html.Label("Tiempo de simulación (días): "),
-            dcc.Input(id='input-tiempo', type='number', value=250, className="input-field"),
+            dcc.Input(id='input-tiempo', type='number', value=250, debounce=True, className="input-field"),
         ], className="input-group"),
 
         html.Button("Simular Epidemia", id='btn-simular', className="btn-generar"),
 
+        modo_vivo('gilpin', ['input-r', 'input-K', 'input-alpha', 'input-tau1', 'input-tau2', 'input-beta',
+                             'input-omega', 'input-A0', 'input-B0', 'input-tiempo']),
+
     ],className="content left"),
 
     html.Div([
@@ -70,6 +81,7 @@ layout = html.Div([
             id='grafica-poblaciones-tiempo',
             style={'height':'450px','width':'100%'},
         ),
+        html.Div(id='gilpin-mensaje'),
         dcc.Graph(
             id='grafica-presa-depredador',
             style={'height':'450px','width':'100%'},
@@ -89,89 +101,137 @@ def modelo_rumor(y, t, r, K, alpha, tau1, tau2, beta, omega):
     return [dA_dt, dB_dt]
 
 
-@callback(
-    Output('grafica-poblaciones-tiempo', 'figure'),
-    Input('btn-simular', 'n_clicks'),
-    State('input-r', 'value'),
-    State('input-K', 'value'),
-    State('input-alpha', 'value'),
-    State('input-tau1', 'value'),
-    State('input-tau2', 'value'),
-    State('input-beta', 'value'),
-    State('input-omega', 'value'),
-    State('input-A0', 'value'),
-    State('input-B0', 'value'),
-    State('input-tiempo', 'value'),
-    prevent_initial_call=False
-)
-def simular_poblaciones(n_clicks, r, K, alpha, tau1, tau2, beta, omega, A0, B0, tiempo_max):
-    y0 = [A0, B0]
+def jacobiano_rumor(y, t, r, K, alpha, tau1, tau2, beta, omega):
+    A, B = y
+    respuesta = A**2/(A**2 + beta)
+    d_respuesta = 2*A*beta/(A**2 + beta)**2
 
-    t = np.linspace(0, tiempo_max, 200)
+    return [[r - r*(alpha + 1)*(A/K)**alpha - tau1*d_respuesta*B, -tau1*respuesta],
+            [tau2*d_respuesta*B, tau2*respuesta - omega]]
 
-    try: 
-        solucion = odeint(modelo_rumor, y0, t, args=(r, K, alpha, tau1, tau2, beta, omega))
-        A,  B = solucion.T
-    except Exception as e:
-        A = np.full_like(t, A0)
-        B = np.full_like(t, B0)
-        
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=t, y=A, 
-        mode='lines', 
-        name='Presas (A)', 
-        line=dict(color='blue', width=2),
-        hovertemplate='Día %{x:.0f}<br>Presas: %{y:.2f}<extra></extra>'
-        )
-    )
-    
-    fig.add_trace(go.Scatter(
-        x=t, y=B,
-        mode='lines',
-        name='Depredadores (B)',  
-        line=dict(color='red', width=2),
-        hovertemplate='Día %{x:.0f}<br>Depredadores: %{y:.2f}<extra></extra>'
-        )
-    )
-    
-    fig.update_layout(
-        title=dict(
-            text = "<b>Evolución de las Poblaciones</b>",
-            x = 0.5, 
-            font=dict(size=16, color='darkblue') 
+
+esqueleto_tiempo = Esqueleto(
+    [
+        go.Scatter(
+            mode='lines', 
+            name='Presas (A)', 
+            line=dict(color='blue', width=2),
+            hovertemplate='Día %{x:.0f}<br>Presas: %{y:.2f}<extra></extra>'
+        ),
+        go.Scatter(
+            mode='lines',
+            name='Depredadores (B)',  
+            line=dict(color='red', width=2),
+            hovertemplate='Día %{x:.0f}<br>Depredadores: %{y:.2f}<extra></extra>'
+        ),
+    ],
+    PLANTILLA_POBLACIONES,
+    title_text="<b>Evolución de las Poblaciones</b>",
+    xaxis_title="tiempo (días)",
+    yaxis_title="Número de animales (A, B)",
+)
+
+esqueleto_fase = Esqueleto(
+    [
+        go.Scatter(
+            mode='lines',
+            name='Todo (C)',  
+            line=dict(color='green', width=2),
+            hovertemplate='Presas %{x:.2f}<br>Depredadores: %{y:.2f}<extra></extra>'
+        ),
+        go.Scatter(
+            mode='lines',
+            name='Ciclo límite',
+            line=dict(color='darkorange', width=2, dash='dash'),
+            hoverinfo='skip'
         ),
-        xaxis_title="tiempo (días)",
-        yaxis_title="Número de animales (A, B)",
-        paper_bgcolor='lightcyan',
-        plot_bgcolor='white',
-        font=dict(family='Outfit',size=12),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.0,
-            xanchor="right",
-            x=0.6
+        go.Scatter(
+            mode='markers',
+            name='Equilibrio estable',
+            marker=dict(color='black', size=10, symbol='circle'),
+            hovertemplate='%{text}<extra></extra>'
         ),
-        margin=dict(l=40, r=40, t=60, b=40),
-    )  
+        go.Scatter(
+            mode='markers',
+            name='Equilibrio inestable',
+            marker=dict(color='black', size=10, symbol='circle-open', line=dict(width=2)),
+            hovertemplate='%{text}<extra></extra>'
+        ),
+        go.Scatter(
+            mode='markers',
+            name='Punto silla',
+            marker=dict(color='black', size=10, symbol='x'),
+            hovertemplate='%{text}<extra></extra>'
+        ),
+    ],
+    PLANTILLA_POBLACIONES,
+    title_text="<b>Depredador vs Presa</b>",
+    xaxis_title="Número de presas (A)",
+    yaxis_title="Número de depredadores (B)",
+)
 
-    fig.update_xaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightpink', 
-        zeroline=True, zerolinewidth= 2,zerolinecolor='black',
+
+@memorizar('gilpin-ayala')
+def resolver_gilpin(r, K, alpha, tau1, tau2, beta, omega, A0, B0, tiempo_max, previa=False):
+    return integrar_adaptativo(
+        nucleo('gilpin-ayala', modelo_rumor), [A0, B0], tiempo_max, args=(r, K, alpha, tau1, tau2, beta, omega),
+        jacobiano=nucleo('gilpin-ayala-jacobiano', jacobiano_rumor),
+        **(OPCIONES_PREVIA if previa else {})
     )
 
-    fig.update_yaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightpink', 
-        zeroline=True, zerolinewidth= 2,zerolinecolor='black',
+
+@memorizar('gilpin-ayala-equilibrios', conservar=lambda analisis: analisis['completo'])
+def analizar_gilpin(r, K, alpha, tau1, tau2, beta, omega):
+    # Solo depende de los parámetros, no de las condiciones iniciales: se
+    # calcula una vez por combinación y se reutiliza al mover A0, B0 o el
+    # horizonte. La malla de B es geométrica porque B* ~ rβ/(τ1 A*) puede
+    # ser muy grande cuando A* es chico.
+    args = (r, K, alpha, tau1, tau2, beta, omega)
+    semillas = malla_semillas((0, 1.2 * K), (0, 1e4), n=20, logaritmica_y=True)
+    return analizar(
+        modelo_rumor, jacobiano_rumor, args, semillas,
+        campo_rapido=nucleo('gilpin-ayala', modelo_rumor),
+        jacobiano_rapido=nucleo('gilpin-ayala-jacobiano', jacobiano_rumor),
     )
 
-    return fig
+
+def _superposicion(analisis):
+    # Trazas de ciclo límite, equilibrios estables, inestables y sillas, en
+    # el orden del esqueleto de fase, y el resumen en texto.
+    grupos = {'estable': [], 'inestable': [], 'silla': []}
+    resumen = []
+    for equilibrio in analisis['equilibrios']:
+        x, y = equilibrio['punto']
+        tipo = equilibrio['tipo']
+        l1, l2 = equilibrio['autovalores']
+        texto = f"({x:.3g}, {y:.3g})<br>{tipo}<br>λ = {l1:.3g}, {l2:.3g}"
+        if tipo == 'silla':
+            grupos['silla'].append((x, y, texto))
+        elif tipo.endswith(' estable'):
+            grupos['estable'].append((x, y, texto))
+        else:
+            grupos['inestable'].append((x, y, texto))
+        resumen.append(f"({x:.3g}, {y:.3g}) {tipo}")
+
+    ciclo = analisis['ciclo']
+    traza_ciclo = dict(x=np.empty(0), y=np.empty(0))
+    if ciclo is not None:
+        traza_ciclo = dict(x=ciclo['x'], y=ciclo['y'])
+        resumen.append(f"ciclo límite de período {ciclo['periodo']:.3g} días")
+    elif not analisis['completo']:
+        resumen.append("la búsqueda del ciclo límite se interrumpió por tiempo")
+
+    trazas = [traza_ciclo]
+    for puntos in grupos.values():
+        x, y, texto = zip(*puntos) if puntos else ((), (), ())
+        trazas.append(dict(x=np.array(x, dtype=float), y=np.array(y, dtype=float), text=list(texto)))
+    return trazas, "Equilibrios: " + " · ".join(resumen)
 
 
 @callback(
-    Output('grafica-presa-depredador', 'figure'),
+    [Output('grafica-poblaciones-tiempo', 'figure'),
+     Output('grafica-presa-depredador', 'figure'),
+     Output('gilpin-mensaje', 'children')],
     Input('btn-simular', 'n_clicks'),
     State('input-r', 'value'),
     State('input-K', 'value'),
@@ -183,61 +243,68 @@ def simular_poblaciones(n_clicks, r, K, alpha, tau1, tau2, beta, omega, A0, B0,
     State('input-A0', 'value'),
     State('input-B0', 'value'),
     State('input-tiempo', 'value'),
+    State('grafica-poblaciones-tiempo', 'figure'),
+    State('grafica-presa-depredador', 'figure'),
     prevent_initial_call=False
 )
+def simular_poblaciones(n_clicks, r, K, alpha, tau1, tau2, beta, omega, A0, B0, tiempo_max, *actuales):
+    return graficar_poblaciones(actuales, r, K, alpha, tau1, tau2, beta, omega, A0, B0, tiempo_max)
 
-def simular_poblaciones2(n_clicks, r, K, alpha, tau1, tau2, beta, omega, A0, B0, tiempo_max):
-    y0 = [A0, B0]
 
-    t = np.linspace(0, tiempo_max, 200)
+def graficar_poblaciones(actuales, r, K, alpha, tau1, tau2, beta, omega, A0, B0, tiempo_max, previa=False):
+    mensaje = revisar(
+        {'r': r, 'K': K, 'α': alpha, 'τ1': tau1, 'τ2': tau2, 'β': beta, 'ω': omega, 'el tiempo': tiempo_max},
+        {'A0': A0, 'B0': B0},
+    )
+    if mensaje:
+        return dash.no_update, dash.no_update, mensaje
 
     try: 
-        solucion = odeint(modelo_rumor, y0, t, args=(r, K, alpha, tau1, tau2, beta, omega))
-        A,  B = solucion.T
-    except Exception as e:
+        t, (A, B) = resolver_gilpin(r, K, alpha, tau1, tau2, beta, omega, A0, B0, tiempo_max, previa=previa)
+    except ErrorSimulacion as e:
+        mensaje = f"No se pudo simular: {e}"
+        t = np.linspace(0, tiempo_max, 200)
         A = np.full_like(t, A0)
         B = np.full_like(t, B0)
-        
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=A, y=B,
-        mode='lines',
-        name='Todo (C)',  
-        line=dict(color='green', width=2),
-        hovertemplate='Presas %{x:.2f}<br>Depredadores: %{y:.2f}<extra></extra>'
-        )
-    )
-    
-    fig.update_layout(
-        title=dict(
-            text = "<b>Depredador vs Presa</b>",
-            x = 0.5, 
-            font=dict(size=16, color='darkblue') 
-        ),
-        xaxis_title="Número de presas (A)",
-        yaxis_title="Número de depredadores (B)",
-        paper_bgcolor='lightcyan',
-        plot_bgcolor='white',
-        font=dict(family='Outfit',size=12),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.0,
-            xanchor="right",
-            x=0.6
-        ),
-        margin=dict(l=40, r=40, t=60, b=40),
-    )  
 
-    fig.update_xaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightpink', 
-        zeroline=True, zerolinewidth= 2,zerolinecolor='black',
-    )
+    try:
+        superposicion, resumen = _superposicion(analizar_gilpin(r, K, alpha, tau1, tau2, beta, omega))
+    except ErrorSimulacion as e:
+        vacia = dict(x=np.empty(0), y=np.empty(0))
+        superposicion, resumen = [vacia] * 4, f"No se pudieron calcular los equilibrios: {e}"
+    mensaje = mensaje or resumen
 
-    fig.update_yaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightpink', 
-        zeroline=True, zerolinewidth= 2,zerolinecolor='black',
-    )
+    actual_tiempo, actual_fase = actuales
+    fig_tiempo = esqueleto_tiempo.actualizar(actual_tiempo, dict(x=t, y=A), dict(x=t, y=B))
+    fig_fase = esqueleto_fase.actualizar(actual_fase, dict(x=A, y=B), *superposicion)
 
-    return fig
\ No newline at end of file
+    return fig_tiempo, fig_fase, mensaje
+
+
+@callback(
+    [Output('grafica-poblaciones-tiempo', 'figure', allow_duplicate=True),
+     Output('grafica-presa-depredador', 'figure', allow_duplicate=True),
+     Output('gilpin-mensaje', 'children', allow_duplicate=True),
+     Output('gilpin-vivo-refinar', 'data')],
+    Input('gilpin-vivo-parametros', 'data'),
+    State('grafica-poblaciones-tiempo', 'figure'),
+    State('grafica-presa-depredador', 'figure'),
+    prevent_initial_call=True
+)
+def previa_poblaciones(datos, *actuales):
+    parametros = coalescedor.recibir('gilpin', datos)
+    return (*graficar_poblaciones(actuales, *parametros, previa=True), datos)
+
+
+@callback(
+    [Output('grafica-poblaciones-tiempo', 'figure', allow_duplicate=True),
+     Output('grafica-presa-depredador', 'figure', allow_duplicate=True),
+     Output('gilpin-mensaje', 'children', allow_duplicate=True)],
+    Input('gilpin-vivo-refinar', 'data'),
+    State('grafica-poblaciones-tiempo', 'figure'),
+    State('grafica-presa-depredador', 'figure'),
+    prevent_initial_call=True
+)
+def refinar_poblaciones(datos, *actuales):
+    parametros = coalescedor.vigente('gilpin', datos)
+    return graficar_poblaciones(actuales, *parametros)
@@ -1,109 +1,144 @@
 import dash
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, Input, Output, State
 import numpy as np
 import plotly.graph_objs as go
-from scipy.integrate import odeint
+from simulacion.cache import memorizar
+from simulacion.figuras import Esqueleto, PLANTILLA_POBLACIONES
+from simulacion.impulsivo import integrar_impulsivo
+from simulacion.metricas import callback
+from simulacion.nucleos import nucleo
+from simulacion.solucionador import ErrorSimulacion
+from simulacion.trabajos import limite, reportar_cada
 
 dash.register_page(__name__, path='/pagina10', name='Gilpin-Ayala 2',order=7)
 
-layout = html.Div([
-    html.Div([
-        html.H2("Modelo Gilpin-Ayala con Cosecha Impulsiva (2.2)", className="title"),
-        html.H4("Parámetros Biológicos"),
+VALORES = {
+    'i-r': 0.25,
+    'i-K': 10,
+    'i-alpha': 0.5,
+    'i-tau1': 0.33,
+    'i-tau2': 0.2,
+    'i-beta': 3.5,
+    'i-omega': 0.1,
+    'i-mu': 0.5,
+    'i-I': 1.5,
+    'i-h': 0.8,
+    'i-c1': 0.7,
+    'i-c2': 0.3,
+    'i-Lambda': 0.0,
+    'i-A0': 4,
+    'i-B0': 1,
+    'i-tiempo': 200,
+}
+
+def layout():
+    # La simulación por defecto se arma aquí, sin pasar por un trabajo en
+    # segundo plano; queda en el cache compartido tras la primera visita.
+    valores = list(VALORES.values())
+    fig_tiempo, fig_fase = figuras_impulsivas(resolver_impulsivo(*valores), *valores)
+    return html.Div([
         html.Div([
+            html.H2("Modelo Gilpin-Ayala con Cosecha Impulsiva (2.2)", className="title"),
+            html.H4("Parámetros Biológicos"),
             html.Div([
-                html.Label("Tasa crec. presa (r):"), 
-                dcc.Input(id='i-r', type='number', value=0.25, step=0.01, className="input-field")
-                ], className="input-group"),
-            html.Div([
-                html.Label("Capacidad carga (K):"), 
-                dcc.Input(id='i-K', type='number', value=10, className="input-field")
-                ], className="input-group"),
-            html.Div([
-                html.Label("Exponente (α):"), 
-                dcc.Input(id='i-alpha', type='number', value=0.5, step=0.01, className="input-field")
-                ], className="input-group"),
-            html.Div([
-                html.Label("Captura (τ1):"), 
-                dcc.Input(id='i-tau1', type='number', value=0.33, step=0.01, className="input-field")
-                ], className="input-group"),
-            html.Div([
-                html.Label("Conversión (τ2):"), 
-                dcc.Input(id='i-tau2', type='number', value=0.2, step=0.01, className="input-field")
-                ], className="input-group"),
-            html.Div([
-                html.Label("Semi-saturación (β):"), 
-                dcc.Input(id='i-beta', type='number', value=3.5, step=0.1, className="input-field")
-                ], className="input-group"),
-            html.Div([
-                html.Label("Mortalidad (ω):"), 
-                dcc.Input(id='i-omega', type='number', value=0.1, step=0.01, className="input-field")
-                ], className="input-group"),
-        ], style={'display': 'grid', 'gridTemplateColumns': '1fr 1fr', 'gap': '10px'}),
+                html.Div([
+                    html.Label("Tasa crec. presa (r):"), 
+                    dcc.Input(id='i-r', type='number', value=VALORES['i-r'], step=0.01, className="input-field")
+                    ], className="input-group"),
+                html.Div([
+                    html.Label("Capacidad carga (K):"), 
+                    dcc.Input(id='i-K', type='number', value=VALORES['i-K'], className="input-field")
+                    ], className="input-group"),
+                html.Div([
+                    html.Label("Exponente (α):"), 
+                    dcc.Input(id='i-alpha', type='number', value=VALORES['i-alpha'], step=0.01, className="input-field")
+                    ], className="input-group"),
+                html.Div([
+                    html.Label("Captura (τ1):"), 
+                    dcc.Input(id='i-tau1', type='number', value=VALORES['i-tau1'], step=0.01, className="input-field")
+                    ], className="input-group"),
+                html.Div([
+                    html.Label("Conversión (τ2):"), 
+                    dcc.Input(id='i-tau2', type='number', value=VALORES['i-tau2'], step=0.01, className="input-field")
+                    ], className="input-group"),
+                html.Div([
+                    html.Label("Semi-saturación (β):"), 
+                    dcc.Input(id='i-beta', type='number', value=VALORES['i-beta'], step=0.1, className="input-field")
+                    ], className="input-group"),
+                html.Div([
+                    html.Label("Mortalidad (ω):"), 
+                    dcc.Input(id='i-omega', type='number', value=VALORES['i-omega'], step=0.01, className="input-field")
+                    ], className="input-group"),
+            ], style={'display': 'grid', 'gridTemplateColumns': '1fr 1fr', 'gap': '10px'}),
 
-        html.Hr(),
+            html.Hr(),
 
-        html.H4("Estrategia de Cosecha"),
-        html.Div([
-            html.Div([
-                html.Label("Peso Presa (μ):"), 
-                dcc.Input(id='i-mu', type='number', value=0.5, step=0.1, className="input-field")
-                ], className="input-group"),
-            html.Div([
-                html.Label("Umbral de Cosecha (I):"), 
-                dcc.Input(id='i-I', type='number', value=1.5, step=0.1, className="input-field")
-                ], className="input-group"),
+            html.H4("Estrategia de Cosecha"),
             html.Div([
-                html.Label("Intensidad (h):"),
-                dcc.Input(id='i-h', type='number', value=0.8, step=0.1, className="input-field")
-                ], className="input-group"),
-            html.Div([
-                html.Label("Tasa captura Presa (c1):"), 
-                dcc.Input(id='i-c1', type='number', value=0.7, step=0.1, className="input-field")
-                ], className="input-group"),
-            html.Div([
-                html.Label("Tasa captura Dep. (c2):"), 
-                dcc.Input(id='i-c2', type='number', value=0.3, step=0.1, className="input-field")
-                ], className="input-group"),
-            html.Div([
-                html.Label("Liberación Dep. (Λ):"), 
-                dcc.Input(id='i-Lambda', type='number', value=0.0, step=0.1, className="input-field")
-                ], className="input-group"),
-        ], style={'display': 'grid', 'gridTemplateColumns': '1fr 1fr', 'gap': '10px'}),
+                html.Div([
+                    html.Label("Peso Presa (μ):"), 
+                    dcc.Input(id='i-mu', type='number', value=VALORES['i-mu'], step=0.1, className="input-field")
+                    ], className="input-group"),
+                html.Div([
+                    html.Label("Umbral de Cosecha (I):"), 
+                    dcc.Input(id='i-I', type='number', value=VALORES['i-I'], step=0.1, className="input-field")
+                    ], className="input-group"),
+                html.Div([
+                    html.Label("Intensidad (h):"),
+                    dcc.Input(id='i-h', type='number', value=VALORES['i-h'], step=0.1, className="input-field")
+                    ], className="input-group"),
+                html.Div([
+                    html.Label("Tasa captura Presa (c1):"), 
+                    dcc.Input(id='i-c1', type='number', value=VALORES['i-c1'], step=0.1, className="input-field")
+                    ], className="input-group"),
+                html.Div([
+                    html.Label("Tasa captura Dep. (c2):"), 
+                    dcc.Input(id='i-c2', type='number', value=VALORES['i-c2'], step=0.1, className="input-field")
+                    ], className="input-group"),
+                html.Div([
+                    html.Label("Liberación Dep. (Λ):"), 
+                    dcc.Input(id='i-Lambda', type='number', value=VALORES['i-Lambda'], step=0.1, className="input-field")
+                    ], className="input-group"),
+            ], style={'display': 'grid', 'gridTemplateColumns': '1fr 1fr', 'gap': '10px'}),
 
-        html.Hr(),
+            html.Hr(),
 
-        html.H4("Valores Iniciales"),
-        html.Div([
-            html.Div([
-                html.Label("A0:"), 
-                dcc.Input(id='i-A0', type='number', value=4, className="input-field")
-                ], className="input-group"),
+            html.H4("Valores Iniciales"),
             html.Div([
-                html.Label("B0:"), 
-                dcc.Input(id='i-B0', type='number', value=1, className="input-field")
-                ], className="input-group"),
-            html.Div([
-                html.Label("Tiempo Máx:"), 
-                dcc.Input(id='i-tiempo', type='number', value=200, className="input-field")
-                ], className="input-group"),
-        ], style={'display': 'grid', 'gridTemplateColumns': '1fr 1fr', 'gap': '10px'}),
+                html.Div([
+                    html.Label("A0:"), 
+                    dcc.Input(id='i-A0', type='number', value=VALORES['i-A0'], className="input-field")
+                    ], className="input-group"),
+                html.Div([
+                    html.Label("B0:"), 
+                    dcc.Input(id='i-B0', type='number', value=VALORES['i-B0'], className="input-field")
+                    ], className="input-group"),
+                html.Div([
+                    html.Label("Tiempo Máx:"), 
+                    dcc.Input(id='i-tiempo', type='number', value=VALORES['i-tiempo'], className="input-field")
+                    ], className="input-group"),
+            ], style={'display': 'grid', 'gridTemplateColumns': '1fr 1fr', 'gap': '10px'}),
+
+            html.Button("Simular Sistema Impulsivo", id='btn-simular-imp', className="btn-generar", style={'marginTop': '20px'}),
 
-        html.Button("Simular Sistema Impulsivo", id='btn-simular-imp', className="btn-generar", style={'marginTop': '20px'}),
+            html.Div(id='estado-impulsivo'),
+            html.Div(id='mensaje-impulsivo'),
 
-    ], className="content left"),
+        ], className="content left"),
 
-    html.Div([
-        html.H2("Dinámica con Pulsos", className="title"),
-        dcc.Graph(
-            id='grafica-impulsiva-tiempo',
-            style={'height': '450px', 'width': '100%'}),
-        dcc.Graph(
-            id='grafica-impulsiva-fase',
-            style={'height': '450px', 'width': '100%'}),
-    ], className="content right"),
+        html.Div([
+            html.H2("Dinámica con Pulsos", className="title"),
+            dcc.Graph(
+                id='grafica-impulsiva-tiempo',
+                figure=fig_tiempo,
+                style={'height': '450px', 'width': '100%'}),
+            dcc.Graph(
+                id='grafica-impulsiva-fase',
+                figure=fig_fase,
+                style={'height': '450px', 'width': '100%'}),
+        ], className="content right"),
 
-], className="page-container")
+    ], className="page-container")
 
 def sistema_continuo(y, t, r, K, alpha, tau1, tau2, beta, omega):
     A, B = y
@@ -114,9 +149,86 @@ def sistema_continuo(y, t, r, K, alpha, tau1, tau2, beta, omega):
     dB_dt = (tau2 * A**2 / (A**2 + beta) - omega) * B
     return [dA_dt, dB_dt]
 
+def jacobiano_continuo(y, t, r, K, alpha, tau1, tau2, beta, omega):
+    # Donde A o B están recortados en 0 el campo no depende de ellos.
+    A, B = max(y[0], 0), max(y[1], 0)
+    respuesta = A**2 / (A**2 + beta)
+    d_respuesta = 2 * A * beta / (A**2 + beta)**2
+
+    J = [[r - r * (alpha + 1) * (A/K)**alpha - tau1 * d_respuesta * B, -tau1 * respuesta],
+         [tau2 * d_respuesta * B, tau2 * respuesta - omega]]
+    for j in range(2):
+        if y[j] < 0:
+            J[0][j] = J[1][j] = 0
+    return J
+
+esqueleto_tiempo = Esqueleto(
+    [
+        go.Scatter(
+            name='Presas (A)', 
+            line=dict(color='blue'),
+            hovertemplate='tiempo %{x:.0f}<br>Presas: %{y:.2f}<extra></extra>'
+        ),
+        go.Scatter(
+            name='Depredadores (B)', 
+            line=dict(color='red'),
+            hovertemplate='tiempo %{x:.0f}<br>Depredadores: %{y:.2f}<extra></extra>'
+        ),
+    ],
+    PLANTILLA_POBLACIONES,
+    title_text="<b>Evolución Temporal con Impulsos</b>",
+    xaxis_title="Tiempo", 
+    yaxis_title="Población",
+)
+
+esqueleto_fase = Esqueleto(
+    [
+        go.Scatter(
+            mode='lines', 
+            name='Trayectoria', 
+            line=dict(color='green'),
+            hovertemplate='Presas %{x:.2f}<br>Depredadores: %{y:.2f}<extra></extra>'
+        ),
+        go.Scatter(
+            mode='lines', 
+            name='C. Pulso (M)', 
+            line=dict(dash='dash', color='orange'),
+            hovertemplate='Presas %{x:.2f}<br>Depredadores: %{y:.2f}<extra></extra>'
+        ),
+        go.Scatter(
+            mode='lines', 
+            name='C. Fase (N)', 
+            line=dict(dash='dot', color='purple'),
+            hovertemplate='Presas %{x:.2f}<br>Depredadores: %{y:.2f}<extra></extra>'
+        ),
+    ],
+    PLANTILLA_POBLACIONES,
+    title_text="<b>Plano de Fase (A vs B)</b>",
+    xaxis_title="Presas (A)", 
+    yaxis_title="Depredadores (B)",
+)
+
+@memorizar('gilpin-ayala-impulsivo', compartido=True)
+def resolver_impulsivo(r, K, alpha, tau1, tau2, beta, omega, mu, I, h, c1, c2, Lambda, A0, B0, t_max,
+                       progreso=None):
+
+    def superficie(y):
+        return mu * y[0] + (1 - mu) * y[1] - I
+
+    def salto(y):
+        return [(1 - c1 * h) * y[0], (1 - c2 * h) * y[1] + Lambda]
+
+    return integrar_impulsivo(
+        nucleo('gilpin-ayala-truncado', sistema_continuo), [A0, B0], t_max, superficie, salto,
+        args=(r, K, alpha, tau1, tau2, beta, omega),
+        progreso=progreso,
+        jacobiano=nucleo('gilpin-ayala-truncado-jacobiano', jacobiano_continuo)
+    )
+
 @callback(
     [Output('grafica-impulsiva-tiempo', 'figure'),
-     Output('grafica-impulsiva-fase', 'figure')],
+     Output('grafica-impulsiva-fase', 'figure'),
+     Output('mensaje-impulsivo', 'children')],
     Input('btn-simular-imp', 'n_clicks'),
     [State('i-r', 'value'), 
      State('i-K', 'value'), 
@@ -133,180 +245,64 @@ def sistema_continuo(y, t, r, K, alpha, tau1, tau2, beta, omega):
      State('i-Lambda', 'value'),
      State('i-A0', 'value'), 
      State('i-B0', 'value'), 
-     State('i-tiempo', 'value')]
+     State('i-tiempo', 'value'),
+     State('grafica-impulsiva-tiempo', 'figure'),
+     State('grafica-impulsiva-fase', 'figure')],
+    background=True,
+    progress=Output('estado-impulsivo', 'children'),
+    progress_default="",
+    cancel=[Input(entrada, 'value') for entrada in VALORES],
+    running=[(Output('btn-simular-imp', 'disabled'), True, False)],
+    interval=250,
+    prevent_initial_call=True
 )
-def simular_sistema_hibrido(n_clicks, r, K, alpha, tau1, tau2, beta, omega, mu, I, h, c1, c2, Lambda, A0, B0, t_max):
-    
-    dt = 0.1  
-    A_current, B_current = A0, B0
+def simular_sistema_hibrido(set_progress, n_clicks, r, K, alpha, tau1, tau2, beta, omega, mu, I, h, c1, c2, Lambda, A0, B0, t_max,
+                            actual_tiempo, actual_fase):
     
-    t_history = [0]
-    A_history = [A0]
-    B_history = [B0]
-    
-    saltos_x = []
-    saltos_y = []
-
-    t_current = 0
-
-
-    while t_current < t_max:
-        
-        valor_control = mu * A_current + (1 - mu) * B_current
-        
-        if valor_control >= I:
-            A_new = (1 - c1 * h) * A_current
-            B_new = (1 - c2 * h) * B_current + Lambda
-            
-            t_history.append(t_current)
-            A_history.append(A_current)
-            B_history.append(B_current)
-            
-            t_history.append(t_current)
-            A_history.append(A_new)
-            B_history.append(B_new)
-            
-            A_current = A_new
-            B_current = B_new
-            
-            t_current += 0.001 
-            
-        else:
-            t_next = t_current + dt
-            sol = odeint(sistema_continuo, [A_current, B_current], [t_current, t_next], 
-                         args=(r, K, alpha, tau1, tau2, beta, omega))
-            
-            A_next, B_next = sol[-1]
-            
-            t_history.append(t_next)
-            A_history.append(A_next)
-            B_history.append(B_next)
-            
-            A_current = A_next
-            B_current = B_next
-            t_current = t_next
+    try:
+        with limite.ranura(lambda: set_progress("En cola: esperando a otras simulaciones...")):
+            solucion = resolver_impulsivo(
+                r, K, alpha, tau1, tau2, beta, omega, mu, I, h, c1, c2, Lambda, A0, B0, t_max,
+                progreso=reportar_cada(set_progress, "Simulando: {:.0%}")
+            )
+    except ErrorSimulacion as e:
+        set_progress("")
+        return dash.no_update, dash.no_update, f"No se pudo simular: {e}"
+    set_progress("")
 
-    fig_tiempo = go.Figure()
-    fig_tiempo.add_trace(go.Scatter(
-        x=t_history, 
-        y=A_history, 
-        name='Presas (A)', 
-        line=dict(color='blue'),
-        hovertemplate='tiempo %{x:.0f}<br>Presas: %{y:.2f}<extra></extra>'
-        )
-    )
-    fig_tiempo.add_trace(go.Scatter(
-        x=t_history, 
-        y=B_history, 
-        name='Depredadores (B)', 
-        line=dict(color='red'),
-        hovertemplate='tiempo %{x:.0f}<br>Depredadores: %{y:.2f}<extra></extra>'
-        )
-    )
-    
-    
-    fig_tiempo.update_layout(
-        title=dict(
-            text = "<b>Evolución Temporal con Impulsos</b>",
-            x = 0.5, 
-            font=dict(size=16, color='darkblue') 
-        ),
-        xaxis_title="Tiempo", 
-        yaxis_title="Población",
-        paper_bgcolor='lightcyan',
-        plot_bgcolor='white',
-        font=dict(family='Outfit',size=12),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.0,
-            xanchor="right",
-            x=0.6
-        ),
-        margin=dict(l=40, r=40, t=60, b=40),
+    fig_tiempo, fig_fase = figuras_impulsivas(
+        solucion, r, K, alpha, tau1, tau2, beta, omega, mu, I, h, c1, c2, Lambda, A0, B0, t_max,
+        actual_tiempo, actual_fase
     )
+    return fig_tiempo, fig_fase, ""
 
-    fig_tiempo.update_xaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightpink', 
-        zeroline=True, zerolinewidth= 2,zerolinecolor='black',
-    )
 
-    fig_tiempo.update_yaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightpink', 
-        zeroline=True, zerolinewidth= 2,zerolinecolor='black',
-    )
+def figuras_impulsivas(solucion, r, K, alpha, tau1, tau2, beta, omega, mu, I, h, c1, c2, Lambda, A0, B0, t_max,
+                       actual_tiempo=None, actual_fase=None):
+    t_history, Y, t_pulsos = solucion
+    A_history, B_history = Y.T
 
-    fig_fase = go.Figure()
-    
-    fig_fase.add_trace(go.Scatter(
-        x=A_history, 
-        y=B_history, 
-        mode='lines', 
-        name='Trayectoria', 
-        line=dict(color='green'),
-        hovertemplate='Presas %{x:.2f}<br>Depredadores: %{y:.2f}<extra></extra>'
-        )
+    fig_tiempo = esqueleto_tiempo.actualizar(
+        actual_tiempo, dict(x=t_history, y=A_history), dict(x=t_history, y=B_history)
     )
-    
-    
-    
+
     A_range = np.linspace(0, K, 100)
+    B_max = B_history.max()*1.1
     if mu != 1:
         B_M = (I - mu * A_range) / (1 - mu)
         C_const = I + ((1-mu)*Lambda)/(1 - c2*h)
         B_N = (C_const - (mu * A_range)/(1 - c1*h)) * ((1 - c2*h)/(1 - mu))
-        
-        fig_fase.add_trace(go.Scatter(
-            x=A_range, 
-            y=B_M, 
-            name='C. Pulso (M)', 
-            line=dict(dash='dash', color='orange'),
-            hovertemplate='Presas %{x:.2f}<br>Depredadores: %{y:.2f}<extra></extra>'
-            )
-        )
-        fig_fase.add_trace(go.Scatter(
-            x=A_range, 
-            y=B_N, 
-            name='C. Fase (N)', 
-            line=dict(dash='dot', color='purple'),
-            hovertemplate='Presas %{x:.2f}<br>Depredadores: %{y:.2f}<extra></extra>'
-            )
-        )
+        curva_M = dict(x=A_range, y=B_M)
+        curva_N = dict(x=A_range, y=B_N)
     else:
-        fig_fase.add_vline(x=I, line_dash="dash", line_color="orange", annotation_text="M")
-        fig_fase.add_vline(x=I*(1-c1*h), line_dash="dot", line_color="purple", annotation_text="N")
+        curva_M = dict(x=[I, I], y=[0, B_max])
+        curva_N = dict(x=[I*(1-c1*h), I*(1-c1*h)], y=[0, B_max])
 
-    fig_fase.update_layout(
-        title=dict(
-            text = "<b>Plano de Fase (A vs B)</b>",
-            x = 0.5, 
-            font=dict(size=16, color='darkblue') 
-        ),
-        xaxis_title="Presas (A)", 
-        yaxis_title="Depredadores (B)",
-        paper_bgcolor='lightcyan',
-        plot_bgcolor='white',
-        font=dict(family='Outfit',size=12),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.0,
-            xanchor="right",
-            x=0.6
-        ),
+    fig_fase = esqueleto_fase.actualizar(
+        actual_fase,
+        dict(x=A_history, y=B_history), curva_M, curva_N,
         xaxis=dict(range=[0, K+1]),
-        yaxis=dict(range=[0, max(B_history)*1.1]),
-        margin=dict(l=40, r=40, t=60, b=40),
-    )
-
-    fig_fase.update_xaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightpink', 
-        zeroline=True, zerolinewidth= 2,zerolinecolor='black',
-    )
-
-    fig_fase.update_yaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightpink', 
-        zeroline=True, zerolinewidth= 2,zerolinecolor='black',
+        yaxis=dict(range=[0, B_max]),
     )
 
-    return fig_tiempo, fig_fase
\ No newline at end of file
+    return fig_tiempo, fig_fase
@@ -1,8 +1,17 @@
 import dash
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, Input, Output, State
 import numpy as np
 import plotly.graph_objs as go
-from scipy.integrate import odeint
+from simulacion.barrido import METRICAS, MAX_RESOLUCION, barrer, figura_barrido
+from simulacion.cache import memorizar
+from simulacion.figuras import Esqueleto, PLANTILLA_EPIDEMIAS
+from simulacion.metricas import callback
+from simulacion.muestreo import integrar_adaptativo
+from simulacion.nucleos import nucleo
+from simulacion.solucionador import ErrorSimulacion
+from simulacion.trabajos import limite
+from simulacion.validacion import revisar
+from simulacion.vivo import OPCIONES_PREVIA, coalescedor, deslizador, modo_vivo
 
 dash.register_page(__name__, path='/pagina7', name='Modelo SEIR',order=9)
 
@@ -12,36 +21,73 @@ layout = html.Div([
 
         html.Div([
             html.Label("Población Total (N):", style={'fontWeight': 'bold'}),
-            dcc.Input(id='input-N', type='number', value=1000, className="input-field"),
+            dcc.Input(id='input-N', type='number', value=1000, debounce=True, className="input-field"),
         ], className="input-group"),
 
         html.Div([
             html.Label("Tasa de transmisión (β):", style={'fontWeight': 'bold'}),
-            dcc.Input(id='input-beta', type='number', value=0.5, step=0.01, className="input-field"),
+            deslizador('input-beta', 0.01, 2.0, 0.01, 0.5),
         ], className="input-group"),
 
         html.Div([
             html.Label("Tasa de incubación (σ):", style={'fontWeight': 'bold'}),
-            dcc.Input(id='input-sigma', type='number', value=0.2, step=0.01, className="input-field"),
+            deslizador('input-sigma', 0.01, 1.0, 0.01, 0.2),
         ], className="input-group"),
 
         html.Div([
             html.Label("Tasa de recuperación (γ):", style={'fontWeight': 'bold'}),
-            dcc.Input(id='input-gamma', type='number', value=0.1, step=0.01, className="input-field"),
+            deslizador('input-gamma', 0.01, 1.0, 0.01, 0.1),
         ], className="input-group"),
 
         html.Div([
             html.Label("Infectados iniciales (I0):", style={'fontWeight': 'bold'}),
-            dcc.Input(id='input-I0', type='number', value=1, className="input-field"),
+            dcc.Input(id='input-I0', type='number', value=1, debounce=True, className="input-field"),
         ], className="input-group"),
 
         html.Div([
             html.Label("Tiempo de simulación (días):", style={'fontWeight': 'bold'}),
-            dcc.Input(id='input-tiempo', type='number', value=100, className="input-field"),
+            dcc.Input(id='input-tiempo', type='number', value=100, debounce=True, className="input-field"),
         ], className="input-group"),
 
         html.Button("Generar gráfica", id='btn-simular', className="btn-generar"),
 
+        modo_vivo('seir', ['input-N', 'input-beta', 'input-sigma', 'input-gamma', 'input-I0', 'input-tiempo']),
+
+        html.Hr(),
+
+        html.H4("Barrido de parámetros"),
+
+        html.Div([
+            html.Label("β mínimo / máximo:", style={'fontWeight': 'bold'}),
+            dcc.Input(id='seir-barrido-beta-min', type='number', value=0.05, step=0.01, className="input-field"),
+            dcc.Input(id='seir-barrido-beta-max', type='number', value=1.5, step=0.01, className="input-field"),
+        ], className="input-group"),
+
+        html.Div([
+            html.Label("γ mínimo / máximo:", style={'fontWeight': 'bold'}),
+            dcc.Input(id='seir-barrido-gamma-min', type='number', value=0.02, step=0.01, className="input-field"),
+            dcc.Input(id='seir-barrido-gamma-max', type='number', value=0.5, step=0.01, className="input-field"),
+        ], className="input-group"),
+
+        html.Div([
+            html.Label("Resolución (máx. 200):", style={'fontWeight': 'bold'}),
+            dcc.Input(id='seir-barrido-resolucion', type='number', value=50, min=2, max=MAX_RESOLUCION, className="input-field"),
+        ], className="input-group"),
+
+        html.Div([
+            html.Label("Métrica:", style={'fontWeight': 'bold'}),
+            dcc.Dropdown(
+                id='seir-barrido-metrica',
+                options=[{'label': v, 'value': k} for k, v in METRICAS.items()],
+                value='pico',
+                clearable=False,
+            ),
+        ], className="input-group"),
+
+        html.Button("Generar barrido", id='seir-btn-barrido', className="btn-generar"),
+
+        html.Div(id='seir-estado-barrido'),
+
     ], className="content left"),
 
     html.Div([
@@ -53,7 +99,14 @@ layout = html.Div([
                 style={'height': '420px', 'width': '100%'}
             ),
             
-        )
+        ),
+
+        html.Div(id='seir-mensaje'),
+
+        dcc.Graph(
+            id='seir-grafica-barrido',
+            style={'height': '420px', 'width': '100%'}
+        ),
 
     ], className="content right"),
 
@@ -69,8 +122,41 @@ def modelo_seir(y, t, beta, sigma, gamma, N):
     return [dS_dt, dE_dt, dI_dt, dR_dt]
 
 
+def jacobiano_seir(y, t, beta, sigma, gamma, N):
+    S, E, I, R = y
+    return [[-beta * I / N, 0, -beta * S / N, 0],
+            [beta * I / N, -sigma, beta * S / N, 0],
+            [0, sigma, -gamma, 0],
+            [0, 0, gamma, 0]]
+
+
+esqueleto_seir = Esqueleto(
+    [
+        go.Scatter(mode='lines', name='Susceptibles (S)', line=dict(color='blue', width=2)),
+        go.Scatter(mode='lines', name='Expuestos (E)', line=dict(color='orange', width=2)),
+        go.Scatter(mode='lines', name='Infectados (I)', line=dict(color='red', width=2)),
+        go.Scatter(mode='lines', name='Recuperados (R)', line=dict(color='green', width=2)),
+    ],
+    PLANTILLA_EPIDEMIAS,
+    xaxis_title="Tiempo (días)",
+    yaxis_title="Número de personas",
+    xaxis=dict(gridcolor='lightgray'),
+    yaxis=dict(gridcolor='lightgray'),
+    legend=dict(y=1.02, x=0.5),
+)
+
+
+@memorizar('seir')
+def resolver_seir(N, beta, sigma, gamma, I0, tiempo_max, previa=False):
+    y0 = [N - I0, 0, I0, 0]
+    return integrar_adaptativo(nucleo('seir', modelo_seir), y0, tiempo_max, args=(beta, sigma, gamma, N),
+                               jacobiano=nucleo('seir-jacobiano', jacobiano_seir),
+                               **(OPCIONES_PREVIA if previa else {}))
+
+
 @callback(
-    Output('grafica-seir', 'figure'),
+    [Output('grafica-seir', 'figure'),
+     Output('seir-mensaje', 'children')],
     Input('btn-simular', 'n_clicks'),
     State('input-N', 'value'),
     State('input-beta', 'value'),
@@ -78,49 +164,115 @@ def modelo_seir(y, t, beta, sigma, gamma, N):
     State('input-gamma', 'value'),
     State('input-I0', 'value'),
     State('input-tiempo', 'value'),
+    State('grafica-seir', 'figure'),
     prevent_initial_call=False
 )
-def simular_seir(n_clicks, N, beta, sigma, gamma, I0, tiempo_max):
+def simular_seir(n_clicks, N, beta, sigma, gamma, I0, tiempo_max, actual):
+    return graficar_seir(actual, N, beta, sigma, gamma, I0, tiempo_max)
+
+
+def graficar_seir(actual, N, beta, sigma, gamma, I0, tiempo_max, previa=False):
+    mensaje = revisar({'N': N, 'β': beta, 'σ': sigma, 'γ': gamma, 'el tiempo': tiempo_max}, {'I0': I0})
+    if mensaje is None and I0 > N:
+        mensaje = "I0 no puede superar N."
+    if mensaje:
+        return dash.no_update, mensaje
+
     S0 = N - I0
-    y0 = [S0, 0, I0, 0]
-    t = np.linspace(0, tiempo_max, 200)
 
+    mensaje = ""
     try:
-        solucion = odeint(modelo_seir, y0, t, args=(beta, sigma, gamma, N))
-        S, E, I, R = solucion.T
-    except:
+        t, (S, E, I, R) = resolver_seir(N, beta, sigma, gamma, I0, tiempo_max, previa=previa)
+    except ErrorSimulacion as e:
+        mensaje = f"No se pudo simular: {e}"
+        t = np.linspace(0, tiempo_max, 200)
         S = np.full_like(t, S0)
         E = np.full_like(t, 0)
         I = np.full_like(t, I0)
         R = np.full_like(t, 0)
 
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(x=t, y=S, mode='lines', name='Susceptibles (S)', line=dict(color='blue', width=2)))
-    fig.add_trace(go.Scatter(x=t, y=E, mode='lines', name='Expuestos (E)', line=dict(color='orange', width=2)))
-    fig.add_trace(go.Scatter(x=t, y=I, mode='lines', name='Infectados (I)', line=dict(color='red', width=2)))
-    fig.add_trace(go.Scatter(x=t, y=R, mode='lines', name='Recuperados (R)', line=dict(color='green', width=2)))
-
-    fig.update_layout(
-        xaxis_title="Tiempo (días)",
-        yaxis_title="Número de personas",
-        paper_bgcolor='lightblue',
-        plot_bgcolor='white',
-        font=dict(family='Outfit', size=12, color='black'),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=0.5),
-        margin=dict(l=40, r=40, t=60, b=40),
+    fig = esqueleto_seir.actualizar(
+        actual,
+        dict(x=t, y=S), dict(x=t, y=E), dict(x=t, y=I), dict(x=t, y=R)
     )
 
-    fig.update_xaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightgray',
-        zeroline=True, zerolinewidth=2, zerolinecolor='black',
-        showline=True, linecolor='black', linewidth=2, mirror=True
-    )
+    return fig, mensaje
 
-    fig.update_yaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightgray',
-        zeroline=True, zerolinewidth=2, zerolinecolor='black',
-        showline=True, linecolor='black', linewidth=2, mirror=True
-    )
 
-    return fig
+@callback(
+    [Output('grafica-seir', 'figure', allow_duplicate=True),
+     Output('seir-mensaje', 'children', allow_duplicate=True),
+     Output('seir-vivo-refinar', 'data')],
+    Input('seir-vivo-parametros', 'data'),
+    State('grafica-seir', 'figure'),
+    prevent_initial_call=True
+)
+def previa_seir(datos, actual):
+    parametros = coalescedor.recibir('seir', datos)
+    return (*graficar_seir(actual, *parametros, previa=True), datos)
+
+
+@callback(
+    [Output('grafica-seir', 'figure', allow_duplicate=True),
+     Output('seir-mensaje', 'children', allow_duplicate=True)],
+    Input('seir-vivo-refinar', 'data'),
+    State('grafica-seir', 'figure'),
+    prevent_initial_call=True
+)
+def refinar_seir(datos, actual):
+    parametros = coalescedor.vigente('seir', datos)
+    return graficar_seir(actual, *parametros)
+
+
+@callback(
+    Output('seir-grafica-barrido', 'figure', allow_duplicate=True),
+    Output('seir-estado-barrido', 'children', allow_duplicate=True),
+    Input('seir-btn-barrido', 'n_clicks'),
+    State('input-N', 'value'),
+    State('input-sigma', 'value'),
+    State('input-I0', 'value'),
+    State('input-tiempo', 'value'),
+    State('seir-barrido-beta-min', 'value'),
+    State('seir-barrido-beta-max', 'value'),
+    State('seir-barrido-gamma-min', 'value'),
+    State('seir-barrido-gamma-max', 'value'),
+    State('seir-barrido-resolucion', 'value'),
+    State('seir-barrido-metrica', 'value'),
+    background=True,
+    progress=[Output('seir-grafica-barrido', 'figure'),
+              Output('seir-estado-barrido', 'children')],
+    cancel=[Input(entrada, 'value') for entrada in
+            ['input-N', 'input-sigma', 'input-I0', 'input-tiempo',
+             'seir-barrido-beta-min', 'seir-barrido-beta-max',
+             'seir-barrido-gamma-min', 'seir-barrido-gamma-max', 'seir-barrido-resolucion']],
+    running=[(Output('seir-btn-barrido', 'disabled'), True, False)],
+    prevent_initial_call=True
+)
+def barrido_seir(set_progress, n_clicks, N, sigma, I0, tiempo_max,
+                 beta_min, beta_max, gamma_min, gamma_max, resolucion, metrica):
+    error = revisar({'N': N, 'σ': sigma, 'el tiempo': tiempo_max,
+                     'β mínimo': beta_min, 'β máximo': beta_max,
+                     'γ mínimo': gamma_min, 'γ máximo': gamma_max}, {'I0': I0})
+    if error:
+        return dash.no_update, error
+
+    n = int(min(max(resolucion or 2, 2), MAX_RESOLUCION))
+    betas = np.linspace(beta_min, beta_max, n)
+    gammas = np.linspace(gamma_min, gamma_max, n)
+    fijos = {'N': N, 'I0': I0, 't_max': tiempo_max, 'sigma': sigma}
+
+    vacia = figura_barrido(betas, gammas, np.full((n, n), np.nan), metrica,
+                           "Tasa de transmisión (β)", "Tasa de recuperación (γ)")
+    en_cola = (vacia, "En cola: esperando a otras simulaciones...")
+
+    try:
+        with limite.ranura(lambda: set_progress(en_cola)):
+            for fraccion, mallas in barrer('seir', betas, gammas, fijos):
+                fig = figura_barrido(betas, gammas, mallas[metrica], metrica,
+                                     "Tasa de transmisión (β)", "Tasa de recuperación (γ)")
+                estado = f"Barrido {fraccion:.0%} completado ({n}×{n} combinaciones)"
+                set_progress((fig, estado))
+    except ErrorSimulacion as e:
+        return dash.no_update, f"No se pudo completar el barrido: {e}"
+
+    return fig, estado
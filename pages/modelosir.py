@@ -1,8 +1,18 @@
 import dash
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, Input, Output, State
 import numpy as np
 import plotly.graph_objs as go
-from scipy.integrate import odeint
+from simulacion.analitico import resumen_sir
+from simulacion.barrido import METRICAS_SIR, MAX_RESOLUCION, barrer, figura_barrido
+from simulacion.cache import memorizar
+from simulacion.figuras import Esqueleto, PLANTILLA_EPIDEMIAS
+from simulacion.metricas import callback
+from simulacion.muestreo import integrar_adaptativo
+from simulacion.nucleos import nucleo
+from simulacion.solucionador import ErrorSimulacion
+from simulacion.trabajos import limite
+from simulacion.validacion import revisar
+from simulacion.vivo import OPCIONES_PREVIA, coalescedor, deslizador, modo_vivo
 
 dash.register_page(__name__, path='/pagina6', name='Modelo SIR',order=8)
 
@@ -12,27 +22,27 @@ layout = html.Div([
 
         html.Div([
             html.Label("Población Total (N):", style={'fontWeight': 'bold'}),
-            dcc.Input(id='input-N', type='number', value=1000, className="input-field"),
+            dcc.Input(id='input-N', type='number', value=1000, debounce=True, className="input-field"),
         ], className="input-group"),
 
         html.Div([
             html.Label("Tasa de transmisión (β):", style={'fontWeight': 'bold'}),
-            dcc.Input(id='input-beta', type='number', value=0.3, step=0.01, className="input-field"),
+            deslizador('input-beta', 0.01, 2.0, 0.01, 0.3),
         ], className="input-group"),
 
         html.Div([
             html.Label("Tasa de recuperación (γ):", style={'fontWeight': 'bold'}),
-            dcc.Input(id='input-gamma', type='number', value=0.1, step=0.01, className="input-field"),
+            deslizador('input-gamma', 0.01, 1.0, 0.01, 0.1),
         ], className="input-group"),
 
         html.Div([
             html.Label("Infectados iniciales (I0):", style={'fontWeight': 'bold'}),
-            dcc.Input(id='input-I0', type='number', value=1, className="input-field"),
+            dcc.Input(id='input-I0', type='number', value=1, debounce=True, className="input-field"),
         ], className="input-group"),
 
         html.Div([
             html.Label("Tiempo de simulación (días):", style={'fontWeight': 'bold'}),
-            dcc.Input(id='input-tiempo', type='number', value=100, className="input-field"),
+            dcc.Input(id='input-tiempo', type='number', value=100, debounce=True, className="input-field"),
         ], className="input-group"),
 
         html.Button(
@@ -41,6 +51,45 @@ layout = html.Div([
             className="btn-generar"
         ),
 
+        modo_vivo('sir', ['input-N', 'input-beta', 'input-gamma', 'input-I0', 'input-tiempo']),
+
+        html.Hr(),
+
+        html.H4("Barrido de parámetros"),
+        html.P("Se calcula en forma cerrada: no usa el tiempo de simulación y el "
+               "tamaño final es el de la epidemia completa."),
+
+        html.Div([
+            html.Label("β mínimo / máximo:", style={'fontWeight': 'bold'}),
+            dcc.Input(id='sir-barrido-beta-min', type='number', value=0.05, step=0.01, className="input-field"),
+            dcc.Input(id='sir-barrido-beta-max', type='number', value=1.0, step=0.01, className="input-field"),
+        ], className="input-group"),
+
+        html.Div([
+            html.Label("γ mínimo / máximo:", style={'fontWeight': 'bold'}),
+            dcc.Input(id='sir-barrido-gamma-min', type='number', value=0.02, step=0.01, className="input-field"),
+            dcc.Input(id='sir-barrido-gamma-max', type='number', value=0.5, step=0.01, className="input-field"),
+        ], className="input-group"),
+
+        html.Div([
+            html.Label("Resolución (máx. 200):", style={'fontWeight': 'bold'}),
+            dcc.Input(id='sir-barrido-resolucion', type='number', value=50, min=2, max=MAX_RESOLUCION, className="input-field"),
+        ], className="input-group"),
+
+        html.Div([
+            html.Label("Métrica:", style={'fontWeight': 'bold'}),
+            dcc.Dropdown(
+                id='sir-barrido-metrica',
+                options=[{'label': v, 'value': k} for k, v in METRICAS_SIR.items()],
+                value='pico',
+                clearable=False,
+            ),
+        ], className="input-group"),
+
+        html.Button("Generar barrido", id='sir-btn-barrido', className="btn-generar"),
+
+        html.Div(id='sir-estado-barrido'),
+
     ], className="content left"),
 
     html.Div([
@@ -49,6 +98,11 @@ layout = html.Div([
             id='grafica-sir',
             style={'height': '450px', 'width': '100%'},
         ),
+        html.Div(id='sir-resumen'),
+        dcc.Graph(
+            id='sir-grafica-barrido',
+            style={'height': '450px', 'width': '100%'},
+        ),
     ], className="content right"),
 
 ], className="page-container")
@@ -60,88 +114,163 @@ def modelo_sir(y, t, beta, gamma, N):
     dR_dt = gamma * I
     return [dS_dt, dI_dt, dR_dt]
 
+def jacobiano_sir(y, t, beta, gamma, N):
+    S, I, R = y
+    return [[-beta * I / N, -beta * S / N, 0],
+            [beta * I / N, beta * S / N - gamma, 0],
+            [0, gamma, 0]]
+
+esqueleto_sir = Esqueleto(
+    [
+        go.Scatter(
+            mode='lines',
+            name='Susceptibles (S)',
+            line=dict(color='blue', width=2),
+            hovertemplate='Día %{x:.0f}<br>Susceptibles: %{y:.0f}<extra></extra>'
+        ),
+        go.Scatter(
+            mode='lines',
+            name='Infectados (I)',
+            line=dict(color='red', width=2),
+            hovertemplate='Día %{x:.0f}<br>Infectados: %{y:.0f}<extra></extra>'
+        ),
+        go.Scatter(
+            mode='lines',
+            name='Recuperados (R)',
+            line=dict(color='green', width=2),
+            hovertemplate='Día %{x:.0f}<br>Recuperados: %{y:.0f}<extra></extra>'
+        ),
+    ],
+    PLANTILLA_EPIDEMIAS,
+    xaxis_title="Tiempo (días)",
+    yaxis_title="Número de personas",
+)
+
+@memorizar('sir')
+def resolver_sir(N, beta, gamma, I0, tiempo_max, previa=False):
+    y0 = [N - I0, I0, 0]
+    return integrar_adaptativo(nucleo('sir', modelo_sir), y0, tiempo_max, args=(beta, gamma, N),
+                               jacobiano=nucleo('sir-jacobiano', jacobiano_sir),
+                               **(OPCIONES_PREVIA if previa else {}))
+
 @callback(
-    Output('grafica-sir', 'figure'),
+    [Output('grafica-sir', 'figure'),
+     Output('sir-resumen', 'children')],
     Input('btn-simular', 'n_clicks'),
     State('input-N', 'value'),
     State('input-beta', 'value'),
     State('input-gamma', 'value'),
     State('input-I0', 'value'),
     State('input-tiempo', 'value'),
+    State('grafica-sir', 'figure'),
     prevent_initial_call=False
 )
-def simular_sir(n_clicks, N, beta, gamma, I0, tiempo_max):
+def simular_sir(n_clicks, N, beta, gamma, I0, tiempo_max, actual):
+    return graficar_sir(actual, N, beta, gamma, I0, tiempo_max)
+
+
+def graficar_sir(actual, N, beta, gamma, I0, tiempo_max, previa=False):
+    error = revisar({'N': N, 'β': beta, 'γ': gamma, 'el tiempo': tiempo_max}, {'I0': I0})
+    if error is None and I0 > N:
+        error = "I0 no puede superar N."
+    if error:
+        return dash.no_update, error
 
     S0 = N - I0
     R0_inicial = 0
-    y0 = [S0, I0, R0_inicial]
-
-    t = np.linspace(0, tiempo_max, 200)
 
     try:
-        solucion = odeint(modelo_sir, y0, t, args=(beta, gamma, N))
-        S, I, R = solucion.T
-    except:
+        t, (S, I, R) = resolver_sir(N, beta, gamma, I0, tiempo_max, previa=previa)
+    except ErrorSimulacion as e:
+        error = f"No se pudo simular: {e}"
+        t = np.linspace(0, tiempo_max, 200)
         S = np.full_like(t, S0)
         I = np.full_like(t, I0)
         R = np.full_like(t, R0_inicial)
 
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=t, y=S,
-        mode='lines',
-        name='Susceptibles (S)',
-        line=dict(color='blue', width=2),
-        hovertemplate='Día %{x:.0f}<br>Susceptibles: %{y:.0f}<extra></extra>'
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=t, y=I,
-        mode='lines',
-        name='Infectados (I)',
-        line=dict(color='red', width=2),
-        hovertemplate='Día %{x:.0f}<br>Infectados: %{y:.0f}<extra></extra>'
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=t, y=R,
-        mode='lines',
-        name='Recuperados (R)',
-        line=dict(color='green', width=2),
-        hovertemplate='Día %{x:.0f}<br>Recuperados: %{y:.0f}<extra></extra>'
-    ))
-
-    fig.update_layout(
-        title=dict(
-            x=0.5,
-            font=dict(size=20, color='green')
-        ),
-        xaxis_title="Tiempo (días)",
-        yaxis_title="Número de personas",
-        paper_bgcolor='lightblue',
-        plot_bgcolor='white',
-        font=dict(family='Outfit', size=12, color='black'),
-        margin=dict(l=40, r=40, t=60, b=40),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.0,
-            xanchor="right",
-            x=0.6
-        ),
+    resumen = resumen_sir(N, beta, gamma, I0)
+    resumen_mensaje = (
+        f"R₀ = {resumen['R0']:.2f} | "
+        f"Pico de infectados: {resumen['pico']:.0f} (día {resumen['dia_pico']:.0f}) | "
+        f"Tamaño final: {resumen['tamano_final']:.0f}"
     )
 
-    fig.update_xaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightpink',
-        zeroline=True, zerolinewidth=2, zerolinecolor='black',
-        showline=True, linecolor='black', linewidth=2, mirror=True
-    )
+    fig = esqueleto_sir.actualizar(actual, dict(x=t, y=S), dict(x=t, y=I), dict(x=t, y=R))
 
-    fig.update_yaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightpink',
-        zeroline=True, zerolinewidth=2, zerolinecolor='black',
-        showline=True, linecolor='black', linewidth=2, mirror=True
-    )
+    return fig, error or resumen_mensaje
+
+
+@callback(
+    [Output('grafica-sir', 'figure', allow_duplicate=True),
+     Output('sir-resumen', 'children', allow_duplicate=True),
+     Output('sir-vivo-refinar', 'data')],
+    Input('sir-vivo-parametros', 'data'),
+    State('grafica-sir', 'figure'),
+    prevent_initial_call=True
+)
+def previa_sir(datos, actual):
+    parametros = coalescedor.recibir('sir', datos)
+    return (*graficar_sir(actual, *parametros, previa=True), datos)
+
+
+@callback(
+    [Output('grafica-sir', 'figure', allow_duplicate=True),
+     Output('sir-resumen', 'children', allow_duplicate=True)],
+    Input('sir-vivo-refinar', 'data'),
+    State('grafica-sir', 'figure'),
+    prevent_initial_call=True
+)
+def refinar_sir(datos, actual):
+    parametros = coalescedor.vigente('sir', datos)
+    return graficar_sir(actual, *parametros)
+
+
+@callback(
+    Output('sir-grafica-barrido', 'figure', allow_duplicate=True),
+    Output('sir-estado-barrido', 'children', allow_duplicate=True),
+    Input('sir-btn-barrido', 'n_clicks'),
+    State('input-N', 'value'),
+    State('input-I0', 'value'),
+    State('sir-barrido-beta-min', 'value'),
+    State('sir-barrido-beta-max', 'value'),
+    State('sir-barrido-gamma-min', 'value'),
+    State('sir-barrido-gamma-max', 'value'),
+    State('sir-barrido-resolucion', 'value'),
+    State('sir-barrido-metrica', 'value'),
+    background=True,
+    progress=[Output('sir-grafica-barrido', 'figure'),
+              Output('sir-estado-barrido', 'children')],
+    cancel=[Input(entrada, 'value') for entrada in
+            ['input-N', 'input-I0', 'sir-barrido-beta-min', 'sir-barrido-beta-max',
+             'sir-barrido-gamma-min', 'sir-barrido-gamma-max', 'sir-barrido-resolucion']],
+    running=[(Output('sir-btn-barrido', 'disabled'), True, False)],
+    prevent_initial_call=True
+)
+def barrido_sir(set_progress, n_clicks, N, I0,
+                beta_min, beta_max, gamma_min, gamma_max, resolucion, metrica):
+    error = revisar({'N': N, 'β mínimo': beta_min, 'β máximo': beta_max,
+                     'γ mínimo': gamma_min, 'γ máximo': gamma_max}, {'I0': I0})
+    if error:
+        return dash.no_update, error
+
+    n = int(min(max(resolucion or 2, 2), MAX_RESOLUCION))
+    betas = np.linspace(beta_min, beta_max, n)
+    gammas = np.linspace(gamma_min, gamma_max, n)
+    fijos = {'N': N, 'I0': I0}
+
+    vacia = figura_barrido(betas, gammas, np.full((n, n), np.nan), metrica,
+                           "Tasa de transmisión (β)", "Tasa de recuperación (γ)", etiquetas=METRICAS_SIR)
+    en_cola = (vacia, "En cola: esperando a otras simulaciones...")
+
+    try:
+        with limite.ranura(lambda: set_progress(en_cola)):
+            for fraccion, mallas in barrer('sir', betas, gammas, fijos):
+                fig = figura_barrido(betas, gammas, mallas[metrica], metrica,
+                                     "Tasa de transmisión (β)", "Tasa de recuperación (γ)",
+                                     etiquetas=METRICAS_SIR)
+                estado = f"Barrido {fraccion:.0%} completado ({n}×{n} combinaciones)"
+                set_progress((fig, estado))
+    except ErrorSimulacion as e:
+        return dash.no_update, f"No se pudo completar el barrido: {e}"
 
-    return fig
+    return fig, estado
@@ -2,7 +2,10 @@ import dash
 from dash import html, dcc
 import plotly.graph_objects as go
 import numpy as np
-from dash.dependencies import Input, Output, State
+from dash.dependencies import ClientsideFunction, Input, Output, State
+from simulacion.cache import memorizar
+from simulacion.figuras import Esqueleto, PLANTILLA_LOGISTICA
+from simulacion.metricas import callback
 
 dash.register_page(__name__, path='/pagina3', name='Pagina 3',order=4)
 
@@ -66,81 +69,90 @@ layout = html.Div(children=[
         dcc.Graph(
             id='grafica-interactiva',
             style={'height': '350px', 'width': '100%'},
-        )
+        ),
+        html.Div(id='logistico-mensaje'),
+        dcc.Store(id='logistico-respaldo'),
     ], className="content right")
 ], className="page-container")
 
-@dash.callback(
-    Output('grafica-interactiva', 'figure'),
+esqueleto_logistico = Esqueleto(
+    [
+        go.Scatter(
+            mode='lines+markers',
+            line=dict(
+                dash='dot',
+                color='black',
+                width=2
+            ),
+            marker=dict(
+                color='blue',
+                symbol='square',
+                size=8
+            ),
+            hovertemplate='t: %{x:.2f}<br>P(t): %{y:.2f}<extra></extra>'
+        ),
+    ],
+    PLANTILLA_LOGISTICA,
+    title_text='<b>Modelo Logístico Interactivo</b>',
+    xaxis_title='Tiempo (t)',
+    yaxis_title='Población P(t)',
+)
+
+@memorizar('logistico')
+def evaluar_logistico(P0, K, r, t_max, n):
+    t = np.linspace(0, t_max, n)
+    if P0 == 0:
+        # P = 0 es un equilibrio; la fórmula cerrada divide por P0.
+        return t, np.zeros_like(t)
+    P = K / (1 + ((K - P0) / P0) * np.exp(-r * t))
+    return t, P
+
+# Los clics se resuelven en el navegador (assets/js/modelos.js); el servidor
+# solo arma la figura inicial y responde cuando el navegador no puede evaluar
+# el modelo con los parámetros dados.
+dash.clientside_callback(
+    ClientsideFunction(namespace='modelos', function_name='logistico'),
+    Output('grafica-interactiva', 'figure', allow_duplicate=True),
+    Output('logistico-respaldo', 'data'),
+    Output('logistico-mensaje', 'children', allow_duplicate=True),
     Input('generar-grafica', 'n_clicks'),
     State('poblacion-inicial', 'value'),
     State('capacidad-carga', 'value'),
     State('tasa-crecimiento', 'value'),
-    State('tiempo-maximo', 'value')
+    State('tiempo-maximo', 'value'),
+    State('grafica-interactiva', 'figure'),
+    prevent_initial_call=True
 )
-def actualizar_grafica(n_clicks, P0, K, r, t_max):
+
+@callback(
+    Output('grafica-interactiva', 'figure'),
+    Output('logistico-mensaje', 'children'),
+    Input('logistico-respaldo', 'data'),
+    State('poblacion-inicial', 'value'),
+    State('capacidad-carga', 'value'),
+    State('tasa-crecimiento', 'value'),
+    State('tiempo-maximo', 'value'),
+    State('grafica-interactiva', 'figure')
+)
+def actualizar_grafica(n_clicks, P0, K, r, t_max, actual):
     if n_clicks is None:
-        t = np.linspace(0, 50, 20)
         P0 = 100
         K = 1000
         r = 0.3
-        P = K / (1 + ((K - P0) / P0) * np.exp(-r * t))
+        t, P = evaluar_logistico(P0, K, r, 50, 20)
     else:
-        t = np.linspace(0, t_max, 50)
-        P = K / (1 + ((K - P0) / P0) * np.exp(-r * t))
-    
-    trace = go.Scatter(
-        x=t,
-        y=P,
-        mode='lines+markers',
-        line=dict(
-            dash='dot',
-            color='black',
-            width=2
-        ),
-        marker=dict(
-            color='blue',
-            symbol='square',
-            size=8
-        ),
-        name=f'P(t) = {K} / (1 + (({K} - {P0})/{P0})e^(-{r}t))',
-        hovertemplate='t: %{x:.2f}<br>P(t): %{y:.2f}<extra></extra>'
-    )
-    
-    fig = go.Figure(data=trace)
-    
-    fig.update_layout(
-        title=dict(
-            text='<b>Modelo Logístico Interactivo</b>',
-            font=dict(
-                size=20,
-                color='green'
-            ),
-            x=0.5,
-            y=0.93
-        ),
-        xaxis_title='Tiempo (t)',
-        yaxis_title='Población P(t)',
-        margin=dict(l=40, r=40, t=50, b=40),
-        paper_bgcolor='lightblue',
-        plot_bgcolor='white',
-        font=dict(
-            family='Outfit',
-            size=11,
-            color='black'
-        )
-    )
-    
-    fig.update_xaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightpink',
-        zeroline=True, zerolinewidth=2, zerolinecolor='red',
-        showline=True, linecolor='black', linewidth=2, mirror=True,
-    )
+        # Aquí llegan justo los casos que el navegador no pudo evaluar.
+        parametros = [P0, K, r, t_max]
+        if any(v is None for v in parametros) or not np.all(np.isfinite(parametros)):
+            return dash.no_update, "Complete P0, K, r y el tiempo máximo con números válidos."
+        with np.errstate(all='ignore'):
+            t, P = evaluar_logistico(P0, K, r, t_max, 50)
+        if not np.all(np.isfinite(P)):
+            return dash.no_update, "El modelo no se puede evaluar con estos parámetros (resultado no finito)."
     
-    fig.update_yaxes(
-        showgrid=True, gridwidth=1, gridcolor='lightpink',
-        zeroline=True, zerolinewidth=2, zerolinecolor='red',
-        showline=True, linecolor='black', linewidth=2, mirror=True,
+    fig = esqueleto_logistico.actualizar(
+        actual,
+        dict(x=t, y=P, name=f'P(t) = {K} / (1 + (({K} - {P0})/{P0})e^(-{r}t))')
     )
     
-    return fig
\ No newline at end of file
+    return fig, ""
\ No newline at end of file
@@ -2,17 +2,11 @@ import dash
 from dash import html, dcc
 import plotly.graph_objects as go
 import numpy as np
-from scipy.integrate import solve_ivp
+from simulacion.cache import memorizar
+from simulacion.lotes import integrar_sir_lote
 
 dash.register_page(__name__, path="/sir-comparativa", name="SIR Comparativa")
 
-def sir(t, y, beta, gamma):
-    S, I, R = y
-    dS = -beta * S * I
-    dI = beta * S * I - gamma * I
-    dR = gamma * I
-    return [dS, dI, dR]
-
 N = 10000
 I0 = 10
 S0 = N - I0
@@ -26,17 +20,23 @@ scenarios = {
     "k_double": {"beta": 0.00005, "gamma": 0.40},
 }
 
+@memorizar('sir-comparativa')
+def resolver_escenarios():
+    # Se integra en la primera visita y no al importar la página.
+    _, _, I_scenarios, _ = integrar_sir_lote(
+        [p["beta"] for p in scenarios.values()],
+        [p["gamma"] for p in scenarios.values()],
+        S0, I0, R0_init, t_span, t_eval=t_eval
+    )
+    return I_scenarios
+
 def layout():
+    I_scenarios = resolver_escenarios()
     fig = go.Figure()
 
-    for name, params in scenarios.items():
-        sol = solve_ivp(
-            sir, t_span, [S0, I0, R0_init],
-            args=(params["beta"], params["gamma"]),
-            t_eval=t_eval
-        )
+    for name, I in zip(scenarios, I_scenarios):
         fig.add_trace(go.Scatter(
-            x=t_eval, y=sol.y[1],
+            x=t_eval, y=I,
             mode="lines",
             name=name
         ))
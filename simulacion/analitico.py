@@ -0,0 +1,53 @@
+import numpy as np
+
+from simulacion.arranque import perezoso
+
+integrate = perezoso('scipy.integrate')
+special = perezoso('scipy.special')
+
+
+def _escalar(valor):
+    return np.asarray(valor)[()]
+
+
+def resumen_sir(N, beta, gamma, I0, R_inicial=0.0, n_cuadratura=400):
+    # Resumen del SIR sin integrar en el tiempo. Acepta escalares o arreglos
+    # (se aplica broadcasting) y devuelve R0, pico de infectados, día del
+    # pico, susceptibles finales y tamaño final N - S(∞).
+    N, beta, gamma, I0, R_inicial = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (N, beta, gamma, I0, R_inicial))
+    )
+    S0 = N - I0 - R_inicial
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        R0 = beta / gamma
+        umbral = N / R0
+
+        # Tamaño final: S∞ = S0·exp(-R0·(N - S∞ - R_inicial)/N), que se
+        # resuelve en forma cerrada con la rama principal de Lambert W. Sin
+        # infectados iniciales la raíz sigue siendo no trivial, pero S no
+        # cambia: S∞ = S0.
+        z = -R0 * (S0 / N) * np.exp(-R0 * (1 - R_inicial / N))
+        S_final = np.where((R0 > 0) & (I0 > 0), -N * special.lambertw(z, 0).real / R0, S0)
+
+        # Pico: I + S - (N/R0)·ln S se conserva y el máximo ocurre en S = N/R0.
+        epidemia = (S0 > umbral) & (I0 > 0)
+        pico = np.where(epidemia, I0 + S0 - umbral * (1 + np.log(S0 / umbral)), I0)
+
+        # Día del pico: con x = ln(S0/S) se cumple dt = N·dx / (β·I(x)). La
+        # malla en x es geométrica cerca de 0 porque ahí I(x) ≈ I0 es pequeño.
+        x_pico = np.where(epidemia, np.log(S0 / umbral), 0.0)
+        L = np.maximum(np.log1p(x_pico * (S0 - umbral) / I0), 1e-12)
+        L = np.where(epidemia, L, 1.0)
+        u = np.linspace(0, 1, n_cuadratura)
+        x = x_pico[..., None] * np.expm1(L[..., None] * u) / np.expm1(L)[..., None]
+        I_x = I0[..., None] + S0[..., None] * (1 - np.exp(-x)) - umbral[..., None] * x
+        dia_pico = np.where(epidemia, N / beta * integrate.trapezoid(1 / I_x, x, axis=-1), 0.0)
+
+    return {
+        'R0': _escalar(R0),
+        'pico': _escalar(pico),
+        'dia_pico': _escalar(dia_pico),
+        'S_final': _escalar(S_final),
+        'tamano_final': _escalar(N - S_final),
+    }
@@ -0,0 +1,87 @@
+import importlib
+import importlib.util
+import re
+import subprocess
+import sys
+import time
+
+import psutil
+
+# Módulos que las páginas no necesitan para registrarse; si aparecen en
+# sys.modules al terminar el arranque, alguna página los importó de más.
+MODULOS_PESADOS = ('scipy.integrate', 'scipy.special', 'scipy.optimize', 'numba')
+
+
+class ModuloPerezoso:
+    # Se importa de verdad en el primer acceso a un atributo, es decir, en la
+    # primera simulación y no al arrancar el worker.
+    def __init__(self, nombre):
+        self._nombre = nombre
+        self._modulo = None
+
+    def __getattr__(self, atributo):
+        if self._modulo is None:
+            self._modulo = importlib.import_module(self._nombre)
+        return getattr(self._modulo, atributo)
+
+
+def perezoso(nombre):
+    return ModuloPerezoso(nombre)
+
+
+class Arranque:
+    # Mide desde que el sistema creó el proceso, así incluye el intérprete y
+    # todas las importaciones sin depender de dónde se construya el objeto.
+    def __init__(self):
+        self.inicio = psutil.Process().create_time()
+        self.segundos = None
+        self.memoria_bytes = None
+        self.cargados = []
+
+    def terminar(self):
+        self.segundos = time.time() - self.inicio
+        self.memoria_bytes = psutil.Process().memory_info().rss
+        self.cargados = [m for m in MODULOS_PESADOS if m in sys.modules]
+        return self
+
+    def reporte(self, paginas=0):
+        cargados = ', '.join(self.cargados) or 'ninguno'
+        return (f"Arranque en {1000 * self.segundos:.0f} ms, "
+                f"{self.memoria_bytes / 2**20:.1f} MB RSS, {paginas} páginas, "
+                f"módulos pesados cargados: {cargados}")
+
+
+def precargar(modulos=MODULOS_PESADOS):
+    # Importa de una vez lo que normalmente se difiere. Con preload_app de
+    # gunicorn se llama en el maestro y los workers lo heredan por
+    # copy-on-write en lugar de importarlo cada uno.
+    from simulacion import nucleos
+
+    for nombre in modulos:
+        if nombre == 'numba' and not nucleos.JIT_ACTIVO:
+            continue
+        if importlib.util.find_spec(nombre.split('.')[0]) is not None:
+            importlib.import_module(nombre)
+    nucleos.precompilar()
+
+
+def tiempos_importacion(modulo='app', limite=15):
+    # Ejecuta un intérprete nuevo con -X importtime y devuelve los paquetes de
+    # primer nivel que más tardan en importarse (tiempo acumulado en ms).
+    salida = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        capture_output=True, text=True,
+    ).stderr
+
+    tiempos = {}
+    for linea in salida.splitlines():
+        m = re.match(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)', linea)
+        if m and len(m.group(2)) <= 2:
+            paquete = m.group(3).split('.')[0]
+            tiempos[paquete] = tiempos.get(paquete, 0) + int(m.group(1)) / 1000
+    return sorted(tiempos.items(), key=lambda par: -par[1])[:limite]
+
+
+if __name__ == '__main__':
+    for paquete, ms in tiempos_importacion(*sys.argv[1:2]):
+        print(f"{paquete:<30} {ms:>9.1f} ms")
@@ -0,0 +1,119 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import plotly.graph_objs as go
+
+from simulacion.analitico import resumen_sir
+from simulacion.figuras import Esqueleto, PLANTILLA_CAMPO
+from simulacion.lotes import integrar_sir_lote, integrar_seir_lote
+from simulacion.trabajos import MAX_TRABAJOS
+
+METRICAS = {
+    'pico': 'Pico de infectados',
+    'dia_pico': 'Día del pico',
+    'tamano_final': 'Tamaño final',
+}
+
+# El barrido SIR usa la forma cerrada: pico y día del pico no dependen del
+# horizonte, pero el tamaño final es el de t → ∞ y no el del día t_max.
+METRICAS_SIR = dict(METRICAS, tamano_final='Tamaño final (t → ∞)')
+
+MAX_RESOLUCION = 200
+
+# Cada barrido ocupa una ranura de simulacion.trabajos.limite; repartir los
+# núcleos entre las ranuras acota el total de procesos a ~cpu_count aunque
+# corran MAX_TRABAJOS barridos a la vez.
+PROCESOS = int(os.environ.get('BARRIDO_PROCESOS', max(1, (os.cpu_count() or 1) // MAX_TRABAJOS)))
+
+esqueleto_barrido = Esqueleto(
+    [go.Heatmap(colorscale='Viridis')],
+    PLANTILLA_CAMPO,
+    xaxis=dict(showgrid=False, zeroline=False),
+    yaxis=dict(showgrid=False, zeroline=False),
+)
+
+
+def _metricas(t, S, I, N):
+    i_pico = I.argmax(axis=1)
+    return {
+        'pico': I.max(axis=1),
+        'dia_pico': t[i_pico],
+        'tamano_final': N - S[:, -1],
+    }
+
+
+def evaluar_bloque(modelo, x, y, fijos):
+    # x e y son los valores de los dos parámetros barridos para cada punto
+    # del bloque; todos los puntos se integran en un solo sistema apilado.
+    N, I0 = fijos['N'], fijos['I0']
+
+    if modelo == 'sir' and fijos.get('analitico', True):
+        # El SIR tiene pico y tamaño final semi-analíticos: no hace falta
+        # integrar en el tiempo ni hay horizonte (ver METRICAS_SIR).
+        resumen = resumen_sir(N, x, y, I0)
+        return {m: resumen[m] for m in METRICAS}
+
+    t_max = fijos['t_max']
+    t_eval = np.linspace(0, t_max, fijos.get('n_t', 400))
+
+    if modelo == 'sir':
+        t, S, I, R = integrar_sir_lote(x, y, N - I0, I0, 0, (0, t_max), t_eval=t_eval, N=N)
+    elif modelo == 'seir':
+        t, S, E, I, R = integrar_seir_lote(
+            x, fijos['sigma'], y, N - I0, 0, I0, 0, (0, t_max), t_eval=t_eval, N=N
+        )
+    else:
+        raise ValueError(f"Modelo desconocido: {modelo}")
+
+    return _metricas(t, S, I, N)
+
+
+def barrer(modelo, valores_x, valores_y, fijos, tamano_bloque=1000, procesos=None):
+    # Generador: cada vez que termina un bloque entrega la fracción completada
+    # y las mallas (ny, nx) de cada métrica, con NaN donde aún no hay datos.
+    X, Y = np.meshgrid(valores_x, valores_y)
+    forma = X.shape
+    x, y = X.ravel(), Y.ravel()
+
+    resultados = {m: np.full(x.size, np.nan) for m in METRICAS}
+    bloques = [slice(i, i + tamano_bloque) for i in range(0, x.size, tamano_bloque)]
+
+    procesos = max(1, min(procesos or PROCESOS, len(bloques)))
+
+    def mallas():
+        return {m: r.reshape(forma) for m, r in resultados.items()}
+
+    if procesos == 1:
+        for k, s in enumerate(bloques, start=1):
+            for m, v in evaluar_bloque(modelo, x[s], y[s], fijos).items():
+                resultados[m][s] = v
+            yield k / len(bloques), mallas()
+        return
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        futuros = {
+            ejecutor.submit(evaluar_bloque, modelo, x[s], y[s], fijos): s
+            for s in bloques
+        }
+        for k, futuro in enumerate(as_completed(futuros), start=1):
+            s = futuros[futuro]
+            for m, v in futuro.result().items():
+                resultados[m][s] = v
+            yield k / len(bloques), mallas()
+
+
+def figura_barrido(valores_x, valores_y, Z, metrica, titulo_x, titulo_y, etiquetas=METRICAS):
+    etiqueta = etiquetas[metrica]
+    fig = esqueleto_barrido.figura(
+        dict(
+            x=valores_x, y=valores_y, z=Z,
+            colorbar=dict(title=dict(text=etiqueta)),
+            hovertemplate=f'{titulo_x}: %{{x:.3f}}<br>{titulo_y}: %{{y:.3f}}<br>'
+                          f'{etiqueta}: %{{z:.2f}}<extra></extra>'
+        ),
+        title=dict(text=f"<b>{etiqueta}</b>"),
+        xaxis=dict(title=dict(text=titulo_x)),
+        yaxis=dict(title=dict(text=titulo_y)),
+    )
+    return fig
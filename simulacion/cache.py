@@ -0,0 +1,154 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+import diskcache
+import numpy as np
+
+from simulacion.metricas import fase
+from simulacion.trabajos import cache_trabajos
+
+
+def normalizar(valor):
+    # Dash entrega los parámetros como int o float según lo que escriba el
+    # usuario; 1 y 1.0 deben compartir la misma entrada del cache.
+    if isinstance(valor, (bool, str)) or valor is None:
+        return valor
+    if isinstance(valor, (int, float, np.integer, np.floating)):
+        return float(valor)
+    if isinstance(valor, (list, tuple, np.ndarray)):
+        return tuple(normalizar(v) for v in valor)
+    if isinstance(valor, dict):
+        return tuple(sorted((k, normalizar(v)) for k, v in valor.items()))
+    return valor
+
+
+def construir_clave(modelo, args, kwargs):
+    return (modelo, normalizar(args), normalizar(kwargs))
+
+
+def _solo_lectura(valor):
+    # Los resultados se comparten entre peticiones, así que nadie debe poder
+    # modificarlos en sitio.
+    if isinstance(valor, np.ndarray):
+        valor.flags.writeable = False
+    elif isinstance(valor, (list, tuple)):
+        for v in valor:
+            _solo_lectura(v)
+    elif isinstance(valor, dict):
+        for v in valor.values():
+            _solo_lectura(v)
+    return valor
+
+
+class CacheSimulaciones:
+    def __init__(self, max_entradas=256, ttl=3600, directorio=None, max_bytes_disco=2**29):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.directorio = directorio
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+        # Nivel en disco compartido por los workers: diskcache lo acota en
+        # bytes con el mismo criterio LRU que la memoria y expira por TTL.
+        self.disco = None
+        if directorio:
+            self.disco = diskcache.Cache(directorio, size_limit=max_bytes_disco,
+                                         eviction_policy='least-recently-used')
+
+    def _nombre(self, clave):
+        return hashlib.sha256(repr(clave).encode()).hexdigest()
+
+    def _leer(self, almacen, clave):
+        guardado = almacen.get(f'simulacion-{self._nombre(clave)}')
+        if guardado is None or guardado[0] != clave:
+            return False, None
+        return True, guardado[1]
+
+    def _escribir(self, almacen, clave, valor):
+        almacen.set(f'simulacion-{self._nombre(clave)}', (clave, valor),
+                    expire=self.ttl, tag='simulacion')
+
+    def obtener(self, clave, compartido=False):
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                instante, valor = entrada
+                if ahora - instante <= self.ttl:
+                    self._entradas.move_to_end(clave)
+                    self.aciertos += 1
+                    return True, valor
+                del self._entradas[clave]
+
+        for almacen in (self.disco, cache_trabajos if compartido else None):
+            if almacen is None:
+                continue
+            encontrado, valor = self._leer(almacen, clave)
+            if encontrado:
+                self._guardar_memoria(clave, _solo_lectura(valor))
+                with self._lock:
+                    self.aciertos += 1
+                return True, valor
+
+        with self._lock:
+            self.fallos += 1
+        return False, None
+
+    def _guardar_memoria(self, clave, valor):
+        with self._lock:
+            self._entradas[clave] = (time.monotonic(), valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def guardar(self, clave, valor, compartido=False):
+        _solo_lectura(valor)
+        self._guardar_memoria(clave, valor)
+        if self.disco is not None:
+            self._escribir(self.disco, clave, valor)
+        if compartido:
+            self._escribir(cache_trabajos, clave, valor)
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+        cache_trabajos.evict('simulacion')
+
+
+cache = CacheSimulaciones(
+    max_entradas=int(os.environ.get('SIMULACION_CACHE_TAMANO', 256)),
+    ttl=float(os.environ.get('SIMULACION_CACHE_TTL', 3600)),
+    directorio=os.environ.get('SIMULACION_CACHE_DIR'),
+    max_bytes_disco=int(os.environ.get('SIMULACION_CACHE_DISCO_BYTES', 2**29)),
+)
+
+
+def memorizar(modelo, compartido=False, conservar=None):
+    # compartido=True guarda además el resultado en el cache de trabajos. Los
+    # callbacks en segundo plano corren en un proceso hijo que termina con el
+    # trabajo, así que sin él su LRU se pierde en cada ejecución. conservar,
+    # si se da, decide por resultado si se guarda (p. ej. no guardar uno que
+    # se cortó por tiempo).
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with fase('solve'):
+                # progreso solo informa avance y no cambia el resultado.
+                clave = construir_clave(
+                    modelo, args, {k: v for k, v in kwargs.items() if k != 'progreso'}
+                )
+                encontrado, valor = cache.obtener(clave, compartido)
+                if encontrado:
+                    return valor
+                valor = funcion(*args, **kwargs)
+                if conservar is None or conservar(valor):
+                    cache.guardar(clave, valor, compartido)
+                return valor
+        return envoltura
+    return decorador
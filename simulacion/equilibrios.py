@@ -0,0 +1,196 @@
+import os
+
+import numpy as np
+
+from simulacion.solucionador import ErrorSimulacion, LimiteExcedido, Presupuesto, resolver
+
+# Tope para buscar un ciclo límite; el resto del análisis (Newton sobre la
+# malla y autovalores) tarda unos pocos milisegundos. Es un resguardo para
+# parámetros patológicos: si se alcanza, el resultado no se memoriza.
+LIMITE_CICLO_SEGUNDOS = float(os.environ.get('EQUILIBRIOS_LIMITE_CICLO', 0.25))
+
+
+def malla_semillas(limites_x, limites_y, n=20, logaritmica_y=False):
+    # Semillas (2, n²) para Newton. Con logaritmica_y el eje y se cubre con
+    # 0 más una malla geométrica, útil cuando la escala del equilibrio
+    # interior depende mucho de los parámetros.
+    x = np.linspace(*limites_x, n)
+    if logaritmica_y:
+        y = np.concatenate([[limites_y[0]], np.geomspace(max(limites_y[0], 1e-3), limites_y[1], n - 1)])
+    else:
+        y = np.linspace(*limites_y, n)
+    X, Y = np.meshgrid(x, y)
+    return np.vstack([X.ravel(), Y.ravel()])
+
+
+def newton_vectorizado(campo, jacobiano, args, semillas, iteraciones=40, tol=1e-10):
+    # Newton para sistemas 2×2 sobre todas las semillas a la vez. campo y
+    # jacobiano siguen la convención de odeint y deben aceptar y de forma
+    # (2, m). Los iterados se proyectan al cuadrante positivo, que es donde
+    # el modelo está definido.
+    z = np.array(semillas, dtype=float)
+    activos = np.ones(z.shape[1], dtype=bool)
+
+    with np.errstate(all='ignore'):
+        for _ in range(iteraciones):
+            f = np.asarray(campo(z[:, activos], 0.0, *args), dtype=float)
+            (a, b), (c, d) = np.asarray(jacobiano(z[:, activos], 0.0, *args), dtype=float)
+            det = a * d - b * c
+            singular = ~np.isfinite(det) | (np.abs(det) < 1e-14)
+            det = np.where(singular, 1.0, det)
+
+            paso_x = (d * f[0] - b * f[1]) / det
+            paso_y = (a * f[1] - c * f[0]) / det
+            paso = np.where(singular, 0.0, np.vstack([paso_x, paso_y]))
+
+            z[:, activos] = np.maximum(z[:, activos] - paso, 0.0)
+            indices = np.flatnonzero(activos)
+            activos[indices[singular | (np.abs(paso).max(axis=0) < tol)]] = False
+            if not activos.any():
+                break
+
+        residuo = np.abs(np.asarray(campo(z, 0.0, *args), dtype=float)).max(axis=0)
+
+    escala = 1.0 + np.abs(z).max(axis=0)
+    convergidos = np.isfinite(residuo) & (residuo < 1e-8 * escala)
+    return z[:, convergidos]
+
+
+def _unicos(puntos, rtol=1e-6):
+    if puntos.shape[1] == 0:
+        return puntos
+    escala = np.maximum(np.abs(puntos).max(axis=1, keepdims=True), 1.0)
+    _, indices = np.unique(np.round(puntos / (escala * rtol)), axis=1, return_index=True)
+    return puntos[:, np.sort(indices)]
+
+
+def clasificar(autovalores, tol=1e-9):
+    reales = autovalores.real
+    if np.any(np.abs(reales) < tol):
+        return 'centro' if np.all(np.abs(autovalores.imag) > tol) else 'no hiperbólico'
+    if reales.min() < 0 < reales.max():
+        return 'silla'
+    tipo = 'foco' if np.any(np.abs(autovalores.imag) > tol) else 'nodo'
+    return f"{tipo} {'estable' if reales.max() < 0 else 'inestable'}"
+
+
+def equilibrios(campo, jacobiano, args, semillas):
+    # Lista de equilibrios con sus autovalores y tipo, ordenada por x.
+    puntos = _unicos(newton_vectorizado(campo, jacobiano, args, semillas))
+    puntos = puntos[:, np.argsort(puntos[0])]
+    resultado = []
+    for x, y in puntos.T:
+        J = np.asarray(jacobiano(np.array([x, y]), 0.0, *args), dtype=float)
+        autovalores = np.linalg.eigvals(J)
+        resultado.append({
+            'punto': (x, y),
+            'autovalores': autovalores,
+            'tipo': clasificar(autovalores),
+        })
+    return resultado
+
+
+def ciclo_limite(campo, args, centro, periodo_estimado, iteraciones=8, tol=1e-3,
+                 jacobiano=None, limite_segundos=None):
+    # Punto fijo del mapa de Poincaré sobre la semirrecta x = x*, y > y*,
+    # que las órbitas cruzan con x decreciente. El mapa se itera con la
+    # aceleración de Steffensen (Δ² de Aitken): cerca de un ciclo débilmente
+    # atractor la iteración simple necesita decenas de vueltas y esta unas
+    # pocas. Devuelve None si no hay ciclo; LimiteExcedido se propaga para
+    # que quien llama sepa que el resultado no es concluyente.
+    x_c, y_c = centro
+    presupuesto = Presupuesto(limite_segundos=limite_segundos or LIMITE_CICLO_SEGUNDOS)
+    horizonte = 10 * periodo_estimado
+
+    def rhs(t, y):
+        return campo(y, t, *args)
+
+    jac = None
+    if jacobiano is not None:
+        def jac(t, y):
+            return jacobiano(y, t, *args)
+
+    def subida(t, y):
+        return y[0] - x_c
+
+    def bajada(t, y):
+        return y[0] - x_c
+
+    subida.terminal = bajada.terminal = True
+    subida.direction = 1
+    bajada.direction = -1
+
+    def media_vuelta(y0, evento):
+        sol = resolver(rhs, (0, horizonte), y0, metodo='LSODA', precision='alta', jac=jac,
+                       events=evento, dense_output=True, presupuesto=presupuesto)
+        return sol if sol.status == 1 else None
+
+    def mapa(y):
+        # Dos medias vueltas: si se empieza sobre la sección con el mismo
+        # sentido del evento, solve_ivp lo detecta en t = 0.
+        abajo = media_vuelta([x_c, y], subida)
+        if abajo is None:
+            return None
+        arriba = media_vuelta(abajo.y_events[0][0], bajada)
+        if arriba is None:
+            return None
+        return arriba.y_events[0][0][1], (abajo, arriba)
+
+    def cerca(a, b):
+        return abs(a - b) < tol * max(abs(b), 1.0)
+
+    y = y_c * 1.05 + 1e-3
+    try:
+        for _ in range(iteraciones):
+            vuelta = mapa(y)
+            if vuelta is None:
+                return None
+            y1 = vuelta[0]
+            if cerca(y1, y):
+                break
+            siguiente = mapa(y1)
+            if siguiente is None:
+                return None
+            y2, vuelta = siguiente[0], siguiente
+            if cerca(y2, y1):
+                break
+            denominador = y2 - 2 * y1 + y
+            acelerado = y - (y1 - y)**2 / denominador if denominador else y2
+            y = acelerado if np.isfinite(acelerado) and acelerado > y_c else y2
+        else:
+            return None
+    except LimiteExcedido:
+        raise
+    except ErrorSimulacion:
+        return None
+
+    if cerca(vuelta[0], y_c):
+        return None
+
+    abajo, arriba = vuelta[1]
+    t_abajo, t_arriba = abajo.t_events[0][0], arriba.t_events[0][0]
+    xa, ya = abajo.sol(np.linspace(0, t_abajo, 100))
+    xb, yb = arriba.sol(np.linspace(0, t_arriba, 100))
+    return {'periodo': t_abajo + t_arriba, 'x': np.concatenate([xa, xb]), 'y': np.concatenate([ya, yb])}
+
+
+def analizar(campo, jacobiano, args, semillas, campo_rapido=None, jacobiano_rapido=None):
+    # Equilibrios, estabilidad y, si hay un foco o nodo inestable en el
+    # interior, el ciclo límite al que se van las órbitas cercanas. completo
+    # es False si la búsqueda del ciclo se cortó por tiempo.
+    puntos = equilibrios(campo, jacobiano, args, semillas)
+    ciclo = None
+    completo = True
+    for equilibrio in puntos:
+        x, y = equilibrio['punto']
+        autovalores = equilibrio['autovalores']
+        if x > 0 and y > 0 and equilibrio['tipo'] in ('foco inestable', 'nodo inestable'):
+            giro = np.abs(autovalores.imag).max()
+            periodo = 2 * np.pi / giro if giro > 0 else 10 / np.abs(autovalores.real).max()
+            try:
+                ciclo = ciclo_limite(campo_rapido or campo, args, (x, y), periodo,
+                                     jacobiano=jacobiano_rapido or jacobiano)
+            except LimiteExcedido:
+                completo = False
+            break
+    return {'equilibrios': puntos, 'ciclo': ciclo, 'completo': completo}
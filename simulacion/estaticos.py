@@ -0,0 +1,94 @@
+import gzip
+import hashlib
+import os
+import threading
+
+import dash
+from dash import dcc, Input, Output
+from flask import Response, abort, request
+
+MAX_AGE = int(os.environ.get('ESTATICOS_MAX_AGE', 86400))
+
+_figuras = {}
+
+
+class FiguraEstatica:
+    # La figura se construye, serializa y comprime una sola vez, en la primera
+    # visita; después cada petición solo copia bytes ya preparados o responde
+    # 304.
+    def __init__(self, nombre, construir):
+        self.nombre = nombre
+        self.construir = construir
+        self.id = f'figura-estatica-{nombre}'
+        self._lock = threading.Lock()
+        self._cuerpo = None
+
+        dash.clientside_callback(
+            """
+            function(url) {
+                // Si la petición falla la gráfica queda como estaba.
+                const sinCambio = window.dash_clientside.no_update;
+                return fetch(url)
+                    .then(respuesta => respuesta.ok ? respuesta.json() : sinCambio)
+                    .catch(() => sinCambio);
+            }
+            """,
+            Output(self.id, 'figure'),
+            Input(f'{self.id}-fuente', 'data'),
+        )
+
+    def _preparar(self):
+        with self._lock:
+            if self._cuerpo is None:
+                cuerpo = self.construir().to_json().encode()
+                self.comprimido = gzip.compress(cuerpo, compresslevel=9, mtime=0)
+                self.etag = hashlib.sha256(cuerpo).hexdigest()[:20]
+                self._cuerpo = cuerpo
+        return self._cuerpo
+
+    @property
+    def url(self):
+        self._preparar()
+        # Relativa a requests_pathname_prefix, para funcionar detrás de un proxy
+        # que sirve la app bajo un subdirectorio.
+        return dash.get_relative_path(f'/figuras/{self.nombre}.json') + f'?v={self.etag}'
+
+    def grafica(self, **props):
+        # dcc.Graph vacío que el navegador llena con la figura precomputada,
+        # así el layout no lleva los datos y la figura queda en el cache HTTP.
+        return [
+            dcc.Store(id=f'{self.id}-fuente', data=self.url),
+            dcc.Graph(id=self.id, **props),
+        ]
+
+    def respuesta(self):
+        cuerpo = self._preparar()
+        if request.if_none_match.contains(self.etag):
+            respuesta = Response(status=304)
+        elif 'gzip' in request.accept_encodings:
+            respuesta = Response(self.comprimido, mimetype='application/json')
+            respuesta.headers['Content-Encoding'] = 'gzip'
+        else:
+            respuesta = Response(cuerpo, mimetype='application/json')
+        respuesta.set_etag(self.etag)
+        respuesta.headers['Cache-Control'] = f'public, max-age={MAX_AGE}'
+        respuesta.headers['Vary'] = 'Accept-Encoding'
+        return respuesta
+
+
+def figura_estatica(nombre):
+    # Decorador para la función que arma la figura de una página estática.
+    def decorador(construir):
+        estatica = FiguraEstatica(nombre, construir)
+        _figuras[nombre] = estatica
+        return estatica
+    return decorador
+
+
+def instalar(app):
+    @app.server.route(f'{app.config.routes_pathname_prefix}figuras/<nombre>.json')
+    def _figura_estatica(nombre):
+        estatica = _figuras.get(nombre)
+        if estatica is None:
+            abort(404)
+        return estatica.respuesta()
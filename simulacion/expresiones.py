@@ -0,0 +1,112 @@
+import ast
+from functools import lru_cache
+from types import SimpleNamespace
+
+import numpy as np
+
+FUNCIONES = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'arcsin': np.arcsin, 'arccos': np.arccos, 'arctan': np.arctan, 'arctan2': np.arctan2,
+    'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+    'exp': np.exp, 'log': np.log, 'log10': np.log10, 'sqrt': np.sqrt,
+    'abs': np.abs, 'sign': np.sign, 'floor': np.floor, 'ceil': np.ceil,
+    'minimum': np.minimum, 'maximum': np.maximum, 'hypot': np.hypot,
+}
+
+CONSTANTES = {'pi': np.pi, 'e': np.e}
+
+VARIABLES = ('X', 'Y', 'x', 'y', 't')
+
+OPERADORES = (
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv,
+    ast.USub, ast.UAdd,
+)
+
+MAX_LONGITUD = 500
+
+
+class _Validador(ast.NodeTransformer):
+    def visit_Expression(self, nodo):
+        nodo.body = self.visit(nodo.body)
+        return nodo
+
+    def visit_BinOp(self, nodo):
+        if not isinstance(nodo.op, OPERADORES):
+            raise ValueError(f"Operador no permitido: {type(nodo.op).__name__}")
+        return self.generic_visit(nodo)
+
+    def visit_UnaryOp(self, nodo):
+        if not isinstance(nodo.op, OPERADORES):
+            raise ValueError(f"Operador no permitido: {type(nodo.op).__name__}")
+        return self.generic_visit(nodo)
+
+    def visit_Constant(self, nodo):
+        if isinstance(nodo.value, bool) or not isinstance(nodo.value, (int, float)):
+            raise ValueError(f"Constante no permitida: {nodo.value!r}")
+        # Los enteros se pasan a float para que potencias como 9**9**9
+        # desborden de inmediato en lugar de construir un entero gigante.
+        return ast.copy_location(ast.Constant(float(nodo.value)), nodo)
+
+    def visit_Name(self, nodo):
+        if nodo.id not in VARIABLES and nodo.id not in CONSTANTES:
+            raise ValueError(f"Nombre no permitido: {nodo.id}")
+        return nodo
+
+    def visit_Attribute(self, nodo):
+        # Solo se acepta la forma np.<función> o np.pi / np.e.
+        if not (isinstance(nodo.value, ast.Name) and nodo.value.id == 'np'
+                and (nodo.attr in FUNCIONES or nodo.attr in CONSTANTES)):
+            raise ValueError(f"Atributo no permitido: {ast.unparse(nodo)}")
+        return nodo
+
+    def visit_Call(self, nodo):
+        if nodo.keywords:
+            raise ValueError("No se permiten argumentos con nombre")
+        funcion = nodo.func
+        if isinstance(funcion, ast.Name):
+            if funcion.id not in FUNCIONES:
+                raise ValueError(f"Función no permitida: {funcion.id}")
+        elif isinstance(funcion, ast.Attribute):
+            self.visit_Attribute(funcion)
+            if funcion.attr not in FUNCIONES:
+                raise ValueError(f"Función no permitida: {funcion.attr}")
+        else:
+            raise ValueError("Llamada no permitida")
+        nodo.args = [self.visit(arg) for arg in nodo.args]
+        return nodo
+
+    def generic_visit(self, nodo):
+        if not isinstance(nodo, (ast.BinOp, ast.UnaryOp, ast.operator, ast.unaryop, ast.Load)):
+            raise ValueError(f"Expresión no permitida: {type(nodo).__name__}")
+        return super().generic_visit(nodo)
+
+
+_ENTORNO = dict(FUNCIONES, **CONSTANTES)
+_ENTORNO['np'] = SimpleNamespace(**FUNCIONES, **CONSTANTES)
+_ENTORNO['__builtins__'] = {}
+
+
+@lru_cache(maxsize=256)
+def compilar(texto):
+    texto = (texto or '').strip()
+    if not texto:
+        raise ValueError("La expresión está vacía")
+    if len(texto) > MAX_LONGITUD:
+        raise ValueError(f"La expresión supera {MAX_LONGITUD} caracteres")
+
+    try:
+        arbol = ast.parse(texto, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Sintaxis inválida: {e.msg}") from None
+
+    arbol = ast.fix_missing_locations(_Validador().visit(arbol))
+    codigo = compile(arbol, '<expresion>', 'eval')
+
+    def evaluar(X, Y, t=0.0):
+        entorno = {'X': X, 'Y': Y, 'x': X, 'y': Y, 't': t}
+        with np.errstate(all='ignore'):
+            resultado = eval(codigo, _ENTORNO, entorno)
+        return np.broadcast_to(np.asarray(resultado, dtype=float), np.shape(X))
+
+    return evaluar
+
@@ -0,0 +1,131 @@
+import base64
+
+import numpy as np
+import plotly.graph_objs as go
+from dash import Patch
+
+
+def _ejes(gridcolor, zerolinecolor='black', borde=False):
+    ejes = dict(
+        showgrid=True, gridwidth=1, gridcolor=gridcolor,
+        zeroline=True, zerolinewidth=2, zerolinecolor=zerolinecolor,
+    )
+    if borde:
+        ejes.update(showline=True, linecolor='black', linewidth=2, mirror=True)
+    return ejes
+
+
+LEYENDA = dict(orientation="h", yanchor="bottom", y=1.0, xanchor="right", x=0.6)
+MARGEN = dict(l=40, r=40, t=60, b=40)
+
+PLANTILLA_POBLACIONES = go.layout.Template(layout=dict(
+    title=dict(x=0.5, font=dict(size=16, color='darkblue')),
+    paper_bgcolor='lightcyan',
+    plot_bgcolor='white',
+    font=dict(family='Outfit', size=12),
+    legend=LEYENDA,
+    margin=MARGEN,
+    xaxis=_ejes('lightpink'),
+    yaxis=_ejes('lightpink'),
+))
+
+PLANTILLA_EPIDEMIAS = go.layout.Template(layout=dict(
+    title=dict(x=0.5, font=dict(size=20, color='green')),
+    paper_bgcolor='lightblue',
+    plot_bgcolor='white',
+    font=dict(family='Outfit', size=12, color='black'),
+    legend=LEYENDA,
+    margin=MARGEN,
+    xaxis=_ejes('lightpink', borde=True),
+    yaxis=_ejes('lightpink', borde=True),
+))
+
+PLANTILLA_CAMPO = go.layout.Template(layout=dict(
+    title=dict(x=0.5, font=dict(size=16, color='green')),
+    paper_bgcolor='lightblue',
+    plot_bgcolor='white',
+    font=dict(family='Outfit', size=12, color='black'),
+    margin=MARGEN,
+    xaxis=_ejes('lightgray', borde=True),
+    yaxis=_ejes('lightgray', borde=True),
+))
+
+PLANTILLA_LOGISTICA = go.layout.Template(layout=dict(
+    title=dict(x=0.5, y=0.93, font=dict(size=20, color='green')),
+    paper_bgcolor='lightblue',
+    plot_bgcolor='white',
+    font=dict(family='Outfit', size=11, color='black'),
+    margin=dict(l=40, r=40, t=50, b=40),
+    xaxis=_ejes('lightpink', zerolinecolor='red', borde=True),
+    yaxis=_ejes('lightpink', zerolinecolor='red', borde=True),
+))
+
+
+def binario(valor, dtype=np.float32):
+    # Convierte arreglos numéricos al formato {dtype, bdata[, shape]} que
+    # plotly.js decodifica como arreglo tipado; el base64 se toma directamente
+    # del buffer de numpy sin pasar por listas de Python.
+    if isinstance(valor, dict):
+        return {clave: binario(v, dtype) for clave, v in valor.items()}
+    if not isinstance(valor, np.ndarray) or valor.dtype.kind not in 'fiub':
+        return valor
+
+    tipo = np.dtype(dtype if valor.dtype.kind == 'f' else np.int32).newbyteorder('<')
+    arreglo = np.ascontiguousarray(valor, dtype=tipo)
+    especificacion = {
+        'dtype': tipo.str[1:],
+        'bdata': base64.b64encode(arreglo.data).decode('ascii'),
+    }
+    if arreglo.ndim > 1:
+        especificacion['shape'] = ','.join(map(str, arreglo.shape))
+    return especificacion
+
+
+def _combinar(base, cambios):
+    # Mezcla a un nivel de profundidad: xaxis=dict(range=...) conserva el
+    # título y el resto del eje definido en el esqueleto.
+    resultado = dict(base)
+    for clave, valor in cambios.items():
+        if isinstance(valor, dict) and isinstance(resultado.get(clave), dict):
+            resultado[clave] = {**resultado[clave], **valor}
+        else:
+            resultado[clave] = valor
+    return resultado
+
+
+class Esqueleto:
+    # Figura prearmada: estilos de trazas y layout se validan una sola vez al
+    # importar la página y cada callback solo aporta los arreglos de datos.
+    def __init__(self, trazas, plantilla, dtype=np.float32, **layout):
+        self.trazas = [traza.to_plotly_json() for traza in trazas]
+        self.layout = go.Layout(template=plantilla, **layout).to_plotly_json()
+        self.dtype = dtype
+
+    def figura(self, *datos, **layout):
+        trazas = [_combinar(traza, binario(d, self.dtype)) for traza, d in zip(self.trazas, datos)]
+        return {'data': trazas, 'layout': _combinar(self.layout, layout)}
+
+    def parche(self, *datos, **layout):
+        # Mismos argumentos que figura(), pero solo viajan los valores que
+        # cambian; el navegador conserva estilos, plantilla y hovertemplates.
+        parche = Patch()
+        for i, d in enumerate(datos):
+            for clave, valor in binario(d, self.dtype).items():
+                parche['data'][i][clave] = valor
+        for clave, valor in layout.items():
+            if isinstance(valor, dict):
+                for subclave, v in valor.items():
+                    parche['layout'][clave][subclave] = v
+            else:
+                parche['layout'][clave] = valor
+        return parche
+
+    def dibujada(self, figura):
+        # El Patch solo sirve si el navegador ya tiene las trazas del
+        # esqueleto; si la figura completa nunca llegó, sigue vacía.
+        return bool(figura) and len(figura.get('data') or ()) == len(self.trazas)
+
+    def actualizar(self, actual, *datos, **layout):
+        if self.dibujada(actual):
+            return self.parche(*datos, **layout)
+        return self.figura(*datos, **layout)
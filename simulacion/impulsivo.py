@@ -0,0 +1,87 @@
+import numpy as np
+
+from simulacion.metricas import registrar_solver
+from simulacion.solucionador import Presupuesto, resolver
+
+
+def integrar_impulsivo(campo, y0, t_max, superficie, salto, args=(),
+                       n_puntos=2000, max_pulsos=5000, precision='alta',
+                       progreso=None, jacobiano=None):
+    # campo(y, t, *args) sigue la convención de odeint usada en pages/.
+    # superficie(y) vale 0 sobre la superficie de control y es positiva
+    # cuando el sistema debe recibir un pulso; salto(y) es el mapa de impulso.
+    def rhs(t, y):
+        return campo(y, t, *args)
+
+    jac = None
+    if jacobiano is not None:
+        def jac(t, y):
+            return jacobiano(y, t, *args)
+
+    def evento(t, y):
+        return superficie(y)
+
+    evento.terminal = True
+    evento.direction = 1
+
+    t_salida = np.linspace(0, t_max, n_puntos)
+
+    capacidad = n_puntos + 2 * max_pulsos + 1
+    T = np.empty(capacidad)
+    Y = np.empty((capacidad, len(y0)))
+    t_pulsos = np.empty(max_pulsos)
+
+    y = np.asarray(y0, dtype=float)
+    t_actual = 0.0
+    T[0] = t_actual
+    Y[0] = y
+    k = 1
+    n_pulsos = 0
+
+    pulsar = superficie(y) >= 0
+    # Un solo presupuesto para todos los tramos entre pulsos.
+    presupuesto = Presupuesto()
+
+    while t_actual < t_max:
+        while pulsar and n_pulsos < max_pulsos:
+            y_nuevo = np.asarray(salto(y), dtype=float)
+            T[k] = t_actual
+            Y[k] = y_nuevo
+            k += 1
+            t_pulsos[n_pulsos] = t_actual
+            n_pulsos += 1
+
+            # Si el salto no aleja al sistema de la superficie se deja de
+            # pulsar; de lo contrario se repite en el mismo instante.
+            pulsar = superficie(y_nuevo) >= 0 and superficie(y_nuevo) < superficie(y)
+            y = y_nuevo
+
+        i0 = np.searchsorted(t_salida, t_actual, side='right')
+        sol = resolver(
+            rhs, (t_actual, t_max), y, precision=precision, jac=jac,
+            presupuesto=presupuesto,
+            t_eval=t_salida[i0:],
+            events=evento if n_pulsos < max_pulsos else None,
+        )
+
+        registrar_solver(sol.nfev, sol.pasos)
+
+        m = sol.t.size
+        T[k:k + m] = sol.t
+        Y[k:k + m] = sol.y.T
+        k += m
+
+        if sol.status != 1:
+            break
+
+        t_actual = sol.t_events[0][0]
+        y = sol.y_events[0][0]
+        T[k] = t_actual
+        Y[k] = y
+        k += 1
+        pulsar = True
+
+        if progreso is not None:
+            progreso(t_actual / t_max)
+
+    return T[:k], Y[:k], t_pulsos[:n_pulsos]
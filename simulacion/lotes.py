@@ -0,0 +1,60 @@
+import numpy as np
+
+from simulacion.metricas import registrar_solver
+from simulacion.solucionador import resolver
+
+
+def _sir_lote(t, y, beta, gamma, N):
+    # y tiene forma (3K,) o (3K, m) cuando solve_ivp evalúa por columnas.
+    S, I, R = np.split(y, 3)
+    infeccion = beta * S * I / N
+    recuperacion = gamma * I
+    return np.concatenate([-infeccion, infeccion - recuperacion, recuperacion])
+
+
+def _seir_lote(t, y, beta, sigma, gamma, N):
+    S, E, I, R = np.split(y, 4)
+    infeccion = beta * S * I / N
+    incubacion = sigma * E
+    recuperacion = gamma * I
+    return np.concatenate([-infeccion, infeccion - incubacion, incubacion - recuperacion, recuperacion])
+
+
+def _columna(valor, K):
+    return np.broadcast_to(np.asarray(valor, dtype=float), (K,)).reshape(K, 1)
+
+
+def _resolver_lote(rhs, y0, params, t_span, t_eval, K, method, **opciones):
+    # Los parámetros van como columnas (K, 1) para que el mismo RHS sirva con
+    # estados (nK,) y (nK, m).
+    y0 = np.concatenate([np.broadcast_to(np.asarray(c, dtype=float), (K,)) for c in y0])
+    params = tuple(_columna(p, K) for p in params)
+
+    def f(t, y):
+        if y.ndim == 1:
+            return rhs(t, y[:, None], *params)[:, 0]
+        return rhs(t, y, *params)
+
+    sol = resolver(f, t_span, y0, metodo=method, t_eval=t_eval, vectorized=True, **opciones)
+    registrar_solver(sol.nfev, sol.pasos)
+    return sol.t, sol.y.reshape(len(y0) // K, K, -1)
+
+
+def integrar_sir_lote(beta, gamma, S0, I0, R0, t_span, t_eval=None, N=1.0,
+                      method='RK45', **opciones):
+    # beta, gamma, S0, I0, R0 y N aceptan escalares o arreglos de K
+    # escenarios; el resultado tiene forma (K, len(t)) por compartimiento.
+    K = np.broadcast(*map(np.asarray, (beta, gamma, N, S0, I0, R0))).size
+    t, (S, I, R) = _resolver_lote(
+        _sir_lote, (S0, I0, R0), (beta, gamma, N), t_span, t_eval, K, method, **opciones
+    )
+    return t, S, I, R
+
+
+def integrar_seir_lote(beta, sigma, gamma, S0, E0, I0, R0, t_span, t_eval=None, N=1.0,
+                       method='RK45', **opciones):
+    K = np.broadcast(*map(np.asarray, (beta, sigma, gamma, N, S0, E0, I0, R0))).size
+    t, (S, E, I, R) = _resolver_lote(
+        _seir_lote, (S0, E0, I0, R0), (beta, sigma, gamma, N), t_span, t_eval, K, method, **opciones
+    )
+    return t, S, E, I, R
@@ -0,0 +1,256 @@
+import contextvars
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+import dash
+from dash import html, dcc, Input, Output
+from dash.exceptions import PreventUpdate
+from flask import Response, g, has_request_context, request
+
+from simulacion.trabajos import cache_trabajos
+
+_actual = contextvars.ContextVar('medicion_callback', default=None)
+
+
+class Medicion:
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.fases = defaultdict(float)
+        self.evaluaciones_rhs = 0
+        self.pasos_solver = 0
+
+
+class Registro:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.llamadas = defaultdict(int)
+        self.errores = defaultdict(int)
+        self.fases = defaultdict(lambda: [0.0, 0])
+        self.evaluaciones_rhs = defaultdict(int)
+        self.pasos_solver = defaultdict(int)
+        self.bytes_respuesta = defaultdict(lambda: [0, 0])
+        self.arranque = None
+        # Proceso que importó el registro. Los trabajos en segundo plano
+        # corren en hijos bifurcados y solo ellos tienen otro pid.
+        self.pid = os.getpid()
+
+    def guardar(self, medicion, total, error=False):
+        with self._lock:
+            nombre = medicion.nombre
+            self.llamadas[nombre] += 1
+            if error:
+                self.errores[nombre] += 1
+            for fase, segundos in list(medicion.fases.items()) + [('total', total)]:
+                acumulado = self.fases[(nombre, fase)]
+                acumulado[0] += segundos
+                acumulado[1] += 1
+            self.evaluaciones_rhs[nombre] += medicion.evaluaciones_rhs
+            self.pasos_solver[nombre] += medicion.pasos_solver
+
+    def enviar(self, medicion, total, error=False):
+        # Desde el proceso hijo de un callback en segundo plano: la medición
+        # se encola en el cache de trabajos y la recoge el servidor web.
+        cache_trabajos.push((medicion, total, error), prefix='metricas', expire=3600)
+
+    def recoger(self):
+        while True:
+            _, valor = cache_trabajos.pull(prefix='metricas')
+            if valor is None:
+                return
+            self.guardar(*valor)
+
+    def observar_respuesta(self, nombre, segundos, n_bytes):
+        with self._lock:
+            acumulado = self.fases[(nombre, 'serializar')]
+            acumulado[0] += segundos
+            acumulado[1] += 1
+            acumulado = self.bytes_respuesta[nombre]
+            acumulado[0] += n_bytes
+            acumulado[1] += 1
+
+    def prometheus(self):
+        self.recoger()
+        with self._lock:
+            lineas = [
+                '# HELP simulacion_callback_llamadas_total Llamadas a cada callback.',
+                '# TYPE simulacion_callback_llamadas_total counter',
+            ]
+            lineas += [f'simulacion_callback_llamadas_total{{callback="{n}"}} {v}'
+                       for n, v in sorted(self.llamadas.items())]
+
+            lineas += [
+                '# HELP simulacion_callback_errores_total Callbacks que lanzaron una excepción.',
+                '# TYPE simulacion_callback_errores_total counter',
+            ]
+            lineas += [f'simulacion_callback_errores_total{{callback="{n}"}} {v}'
+                       for n, v in sorted(self.errores.items())]
+
+            lineas += [
+                '# HELP simulacion_callback_fase_segundos Tiempo por fase (solve, figura, serializar, total).',
+                '# TYPE simulacion_callback_fase_segundos summary',
+            ]
+            for (n, fase), (suma, cuenta) in sorted(self.fases.items()):
+                etiquetas = f'callback="{n}",fase="{fase}"'
+                lineas.append(f'simulacion_callback_fase_segundos_sum{{{etiquetas}}} {suma:.6f}')
+                lineas.append(f'simulacion_callback_fase_segundos_count{{{etiquetas}}} {cuenta}')
+
+            lineas += [
+                '# HELP simulacion_rhs_evaluaciones_total Evaluaciones del lado derecho de la EDO.',
+                '# TYPE simulacion_rhs_evaluaciones_total counter',
+            ]
+            lineas += [f'simulacion_rhs_evaluaciones_total{{callback="{n}"}} {v}'
+                       for n, v in sorted(self.evaluaciones_rhs.items())]
+
+            lineas += [
+                '# HELP simulacion_pasos_solver_total Pasos aceptados por el integrador.',
+                '# TYPE simulacion_pasos_solver_total counter',
+            ]
+            lineas += [f'simulacion_pasos_solver_total{{callback="{n}"}} {v}'
+                       for n, v in sorted(self.pasos_solver.items())]
+
+            lineas += [
+                '# HELP simulacion_respuesta_bytes Tamaño de la respuesta JSON de cada callback.',
+                '# TYPE simulacion_respuesta_bytes summary',
+            ]
+            for n, (suma, cuenta) in sorted(self.bytes_respuesta.items()):
+                lineas.append(f'simulacion_respuesta_bytes_sum{{callback="{n}"}} {suma}')
+                lineas.append(f'simulacion_respuesta_bytes_count{{callback="{n}"}} {cuenta}')
+
+            if self.arranque is not None:
+                lineas += [
+                    '# HELP simulacion_arranque_segundos Tiempo desde que se creó el proceso hasta tener la app lista.',
+                    '# TYPE simulacion_arranque_segundos gauge',
+                    f'simulacion_arranque_segundos {self.arranque.segundos:.6f}',
+                    '# HELP simulacion_arranque_memoria_bytes Memoria residente al terminar el arranque.',
+                    '# TYPE simulacion_arranque_memoria_bytes gauge',
+                    f'simulacion_arranque_memoria_bytes {self.arranque.memoria_bytes}',
+                ]
+
+        return '\n'.join(lineas) + '\n'
+
+    def resumen(self):
+        self.recoger()
+        with self._lock:
+            filas = []
+            for nombre, llamadas in sorted(self.llamadas.items()):
+                def promedio(fase):
+                    suma, cuenta = self.fases.get((nombre, fase), (0.0, 0))
+                    return 1000 * suma / cuenta if cuenta else 0.0
+                suma_bytes, cuenta_bytes = self.bytes_respuesta.get(nombre, (0, 0))
+                filas.append(
+                    f"{nombre:<28} {llamadas:>6} "
+                    f"{promedio('total'):>9.1f} {promedio('solve'):>9.1f} "
+                    f"{promedio('figura'):>9.1f} {promedio('serializar'):>9.1f} "
+                    f"{(suma_bytes / cuenta_bytes if cuenta_bytes else 0) / 1024:>9.1f}"
+                )
+        encabezado = (f"{'callback':<28} {'llamadas':>6} {'total ms':>9} {'solve ms':>9} "
+                      f"{'figura ms':>9} {'serial ms':>9} {'KB':>9}")
+        return '\n'.join([encabezado] + filas)
+
+
+registro = Registro()
+
+
+@contextmanager
+def fase(nombre):
+    medicion = _actual.get()
+    if medicion is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicion.fases[nombre] += time.perf_counter() - inicio
+
+
+def registrar_solver(evaluaciones_rhs=0, pasos=0):
+    # Lo llaman los integradores de simulacion; fuera de un callback no hace nada.
+    medicion = _actual.get()
+    if medicion is not None:
+        medicion.evaluaciones_rhs += evaluaciones_rhs
+        medicion.pasos_solver += pasos
+
+
+def instrumentar(funcion, en_segundo_plano=False):
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        medicion = Medicion(funcion.__name__)
+        token = _actual.set(medicion)
+        inicio = time.perf_counter()
+        error = False
+        try:
+            return funcion(*args, **kwargs)
+        except PreventUpdate:
+            # Descartes intencionales (p. ej. del coalescedor de vivo.py).
+            raise
+        except Exception:
+            error = True
+            raise
+        finally:
+            total = time.perf_counter() - inicio
+            _actual.reset(token)
+            # Lo que no se marcó explícitamente como otra fase es armado de figura.
+            medicion.fases['figura'] = max(total - sum(medicion.fases.values()), 0.0)
+            if en_segundo_plano and os.getpid() != registro.pid:
+                registro.enviar(medicion, total, error)
+            else:
+                # Llamada en el mismo proceso (p. ej. desde los benchmarks):
+                # encolarla la dejaría para el /metrics de otro servidor.
+                registro.guardar(medicion, total, error)
+            if has_request_context():
+                g.callback_nombre = medicion.nombre
+                g.callback_segundos = total
+    return envoltura
+
+
+def callback(*args, **kwargs):
+    # Reemplazo de dash.callback que instrumenta la función antes de registrarla.
+    registrar = dash.callback(*args, **kwargs)
+
+    def decorador(funcion):
+        return registrar(instrumentar(funcion, kwargs.get('background', False)))
+
+    return decorador
+
+
+def instalar(server):
+    @server.before_request
+    def _iniciar_peticion():
+        g.inicio_peticion = time.perf_counter()
+
+    @server.after_request
+    def _medir_respuesta(respuesta):
+        # La serialización ocurre en Dash después de que el callback retorna,
+        # así que se estima como el tiempo de la petición menos el del callback.
+        nombre = g.get('callback_nombre')
+        if nombre is not None and request.path.endswith('_dash-update-component'):
+            total = time.perf_counter() - g.inicio_peticion
+            n_bytes = respuesta.calculate_content_length()
+            if n_bytes is None:
+                n_bytes = len(respuesta.get_data())
+            registro.observar_respuesta(nombre, max(total - g.callback_segundos, 0.0), n_bytes)
+        return respuesta
+
+    @server.route('/metrics')
+    def _metricas():
+        return Response(registro.prometheus(), mimetype='text/plain; version=0.0.4')
+
+
+def panel(intervalo_ms=5000):
+    @dash.callback(
+        Output('panel-metricas-contenido', 'children'),
+        Input('panel-metricas-intervalo', 'n_intervals'),
+    )
+    def actualizar_panel(n_intervals):
+        return registro.resumen()
+
+    return html.Details([
+        html.Summary("Métricas de callbacks"),
+        html.Pre(id='panel-metricas-contenido', style={'fontSize': '12px'}),
+        dcc.Interval(id='panel-metricas-intervalo', interval=intervalo_ms),
+    ], className='panel-metricas')
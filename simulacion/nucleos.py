@@ -0,0 +1,195 @@
+import importlib.util
+import os
+import warnings
+
+import numpy as np
+
+# SIMULACION_JIT=0 fuerza las versiones en Python puro de pages/. numba solo
+# se importa cuando se pide el primer núcleo, no al arrancar.
+JIT_ACTIVO = (importlib.util.find_spec('numba') is not None
+              and os.environ.get('SIMULACION_JIT', '1') != '0')
+
+# Dónde guarda numba el código compilado entre arranques. Por defecto
+# escribiría junto a los .py, que en un despliegue de solo lectura falla;
+# con SIMULACION_JIT_CACHE_DIR='' no se guarda en disco.
+DIRECTORIO_JIT = os.environ.get('SIMULACION_JIT_CACHE_DIR', './.cache-numba')
+
+
+def _sir(y, t, beta, gamma, N):
+    S, I = y[0], y[1]
+    infeccion = beta * S * I / N
+    dy = np.empty(3)
+    dy[0] = -infeccion
+    dy[1] = infeccion - gamma * I
+    dy[2] = gamma * I
+    return dy
+
+
+def _seir(y, t, beta, sigma, gamma, N):
+    S, E, I = y[0], y[1], y[2]
+    infeccion = beta * S * I / N
+    dy = np.empty(4)
+    dy[0] = -infeccion
+    dy[1] = infeccion - sigma * E
+    dy[2] = sigma * E - gamma * I
+    dy[3] = gamma * I
+    return dy
+
+
+def _gilpin(y, t, r, K, alpha, tau1, tau2, beta, omega):
+    A, B = y[0], y[1]
+    respuesta = A**2 / (A**2 + beta)
+    dy = np.empty(2)
+    dy[0] = r * A * (1 - (A / K)**alpha) - tau1 * respuesta * B
+    dy[1] = (tau2 * respuesta - omega) * B
+    return dy
+
+
+def _gilpin_truncado(y, t, r, K, alpha, tau1, tau2, beta, omega):
+    # Igual que sistema_continuo de depredadorpresa2: recorta A y B en 0.
+    A, B = max(y[0], 0.0), max(y[1], 0.0)
+    respuesta = A**2 / (A**2 + beta)
+    dy = np.empty(2)
+    dy[0] = r * A * (1 - (A / K)**alpha) - tau1 * respuesta * B
+    dy[1] = (tau2 * respuesta - omega) * B
+    return dy
+
+
+def _sir_jacobiano(y, t, beta, gamma, N):
+    S, I = y[0], y[1]
+    J = np.zeros((3, 3))
+    J[0, 0] = -beta * I / N
+    J[0, 1] = -beta * S / N
+    J[1, 0] = beta * I / N
+    J[1, 1] = beta * S / N - gamma
+    J[2, 1] = gamma
+    return J
+
+
+def _seir_jacobiano(y, t, beta, sigma, gamma, N):
+    S, I = y[0], y[2]
+    J = np.zeros((4, 4))
+    J[0, 0] = -beta * I / N
+    J[0, 2] = -beta * S / N
+    J[1, 0] = beta * I / N
+    J[1, 1] = -sigma
+    J[1, 2] = beta * S / N
+    J[2, 1] = sigma
+    J[2, 2] = -gamma
+    J[3, 2] = gamma
+    return J
+
+
+def _gilpin_jacobiano(y, t, r, K, alpha, tau1, tau2, beta, omega):
+    A, B = y[0], y[1]
+    respuesta = A**2 / (A**2 + beta)
+    d_respuesta = 2 * A * beta / (A**2 + beta)**2
+    J = np.empty((2, 2))
+    J[0, 0] = r - r * (alpha + 1) * (A / K)**alpha - tau1 * d_respuesta * B
+    J[0, 1] = -tau1 * respuesta
+    J[1, 0] = tau2 * d_respuesta * B
+    J[1, 1] = tau2 * respuesta - omega
+    return J
+
+
+def _gilpin_truncado_jacobiano(y, t, r, K, alpha, tau1, tau2, beta, omega):
+    # Donde una variable está recortada en 0 el campo no depende de ella.
+    A, B = max(y[0], 0.0), max(y[1], 0.0)
+    respuesta = A**2 / (A**2 + beta)
+    d_respuesta = 2 * A * beta / (A**2 + beta)**2
+    J = np.empty((2, 2))
+    J[0, 0] = r - r * (alpha + 1) * (A / K)**alpha - tau1 * d_respuesta * B
+    J[0, 1] = -tau1 * respuesta
+    J[1, 0] = tau2 * d_respuesta * B
+    J[1, 1] = tau2 * respuesta - omega
+    if y[0] < 0:
+        J[0, 0] = 0.0
+        J[1, 0] = 0.0
+    if y[1] < 0:
+        J[0, 1] = 0.0
+        J[1, 1] = 0.0
+    return J
+
+
+NUCLEOS = {
+    'sir': _sir,
+    'seir': _seir,
+    'gilpin-ayala': _gilpin,
+    'gilpin-ayala-truncado': _gilpin_truncado,
+    'sir-jacobiano': _sir_jacobiano,
+    'seir-jacobiano': _seir_jacobiano,
+    'gilpin-ayala-jacobiano': _gilpin_jacobiano,
+    'gilpin-ayala-truncado-jacobiano': _gilpin_truncado_jacobiano,
+}
+
+# Puntos de prueba (estado, parámetros) con los que se compara el núcleo
+# compilado contra la función de referencia antes de usarlo.
+MUESTRAS = {
+    'sir': ([990.0, 10.0, 0.0], (0.3, 0.1, 1000.0)),
+    'seir': ([980.0, 10.0, 10.0, 0.0], (0.5, 0.2, 0.1, 1000.0)),
+    'gilpin-ayala': ([4.0, 1.0], (0.25, 10.0, 0.5, 0.33, 0.2, 3.5, 0.1)),
+    'gilpin-ayala-truncado': ([4.0, 1.0], (0.25, 10.0, 0.5, 0.33, 0.2, 3.5, 0.1)),
+}
+MUESTRAS.update({f'{nombre}-jacobiano': muestra for nombre, muestra in list(MUESTRAS.items())})
+
+_compilados = {}
+_precompilados = {}
+
+
+def verificar(funcion, referencia, nombre, rtol=1e-12):
+    y, args = MUESTRAS[nombre]
+    esperado = np.asarray(referencia(np.array(y), 0.0, *args), dtype=float)
+    obtenido = np.asarray(funcion(np.array(y), 0.0, *args), dtype=float)
+    return np.allclose(obtenido, esperado, rtol=rtol, atol=0.0)
+
+
+def compilar(nombre):
+    # Firma explícita: todo float64. numba compila una sola especialización
+    # al crear el núcleo y convierte los int que llegan de los dcc.Input, en
+    # vez de compilar otra por cada combinación de int y float.
+    import numba
+    from numba import types
+
+    if DIRECTORIO_JIT and not numba.config.CACHE_DIR:
+        numba.config.CACHE_DIR = DIRECTORIO_JIT
+    _, args = MUESTRAS[nombre]
+    firma = (types.float64[:], types.float64) + (types.float64,) * len(args)
+    return numba.njit(firma, cache=bool(numba.config.CACHE_DIR))(NUCLEOS[nombre])
+
+
+def nucleo(nombre, referencia):
+    # Devuelve el RHS compilado con numba si está disponible y coincide con
+    # la referencia en los puntos de prueba; si no, la propia referencia.
+    if not JIT_ACTIVO:
+        return referencia
+
+    if nombre not in _compilados:
+        try:
+            compilado = _precompilados.pop(nombre, None)
+            if compilado is None:
+                compilado = compilar(nombre)
+            if not verificar(compilado, referencia, nombre):
+                raise ValueError("el resultado no coincide con la referencia")
+        except Exception as e:
+            warnings.warn(f"Núcleo '{nombre}' no disponible, se usa Python: {e}")
+            compilado = None
+        _compilados[nombre] = compilado
+
+    return _compilados[nombre] or referencia
+
+
+def precompilar():
+    # Compila todos los núcleos sin esperar a la primera simulación; con
+    # preload de gunicorn el código máquina queda en el maestro y lo
+    # comparten los workers. nucleo() los verifica igual.
+    if not JIT_ACTIVO:
+        return
+    for nombre in NUCLEOS:
+        if nombre in _compilados or nombre in _precompilados:
+            continue
+        try:
+            compilado = compilar(nombre)
+        except Exception as e:
+            warnings.warn(f"No se pudo precompilar el núcleo '{nombre}': {e}")
+            continue
+        _precompilados[nombre] = compilado
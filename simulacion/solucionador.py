@@ -0,0 +1,169 @@
+import os
+import time
+
+import numpy as np
+
+from simulacion.arranque import perezoso
+
+integrate = perezoso('scipy.integrate')
+
+# Tolerancias por nivel de precisión. 'normal' son las de solve_ivp por
+# defecto. Las páginas usaban odeint (rtol ~1.5e-8), así que el valor por
+# defecto es 'alta': con 'normal' Gilpin-Ayala con K grande se dispara a
+# poblaciones negativas. 'previa' es solo para la vista previa en vivo.
+PRECISIONES = {
+    'previa': dict(rtol=1e-2, atol=1e-4),
+    'normal': dict(rtol=1e-3, atol=1e-6),
+    'alta': dict(rtol=1e-6, atol=1e-9),
+    'maxima': dict(rtol=1e-9, atol=1e-11),
+}
+PRECISION = os.environ.get('SIMULACION_PRECISION', 'alta')
+
+MAX_EVALUACIONES = int(os.environ.get('SIMULACION_MAX_EVALUACIONES', 500_000))
+LIMITE_SEGUNDOS = float(os.environ.get('SIMULACION_LIMITE_SEGUNDOS', 10))
+
+# Se considera rígido un problema cuyo autovalor más rápido, multiplicado por
+# el horizonte, obligaría a un método explícito a dar más pasos que esto.
+UMBRAL_RIGIDEZ = float(os.environ.get('SIMULACION_UMBRAL_RIGIDEZ', 1e4))
+MAX_DIMENSION_DETECCION = 50
+
+
+class ErrorSimulacion(RuntimeError):
+    pass
+
+
+class LimiteExcedido(ErrorSimulacion):
+    pass
+
+
+class Presupuesto:
+    # Cuenta evaluaciones del RHS y corta la integración si se pasa del
+    # máximo o del tiempo de reloj permitido. Un mismo presupuesto puede
+    # repartirse entre varias llamadas al integrador (p. ej. entre pulsos).
+    def __init__(self, max_evaluaciones=MAX_EVALUACIONES, limite_segundos=LIMITE_SEGUNDOS):
+        self.max_evaluaciones = max_evaluaciones
+        self.limite_segundos = limite_segundos
+        self.fin = time.monotonic() + limite_segundos
+        self.evaluaciones = 0
+
+    def envolver(self, rhs):
+        def f(t, y):
+            self.evaluaciones += 1
+            if self.evaluaciones > self.max_evaluaciones:
+                raise LimiteExcedido(
+                    f"La simulación superó el máximo de {self.max_evaluaciones} evaluaciones "
+                    f"(t = {t:.4g}). Pruebe con un horizonte más corto o parámetros menos extremos."
+                )
+            if self.evaluaciones % 64 == 0 and time.monotonic() > self.fin:
+                raise LimiteExcedido(
+                    f"La simulación superó el límite de {self.limite_segundos:g} s "
+                    f"(t = {t:.4g}). Pruebe con un horizonte más corto o parámetros menos extremos."
+                )
+            return rhs(t, y)
+        return f
+
+
+def jacobiano_numerico(rhs, t, y):
+    y = np.asarray(y, dtype=float)
+    f0 = np.asarray(rhs(t, y), dtype=float)
+    J = np.empty((f0.size, y.size))
+    for j in range(y.size):
+        h = 1e-7 * max(abs(y[j]), 1.0)
+        y_h = y.copy()
+        y_h[j] += h
+        J[:, j] = (np.asarray(rhs(t, y_h), dtype=float) - f0) / h
+    return J
+
+
+def verificar_jacobiano(rhs, jac, t, y, rtol=1e-4, atol=1e-6):
+    # Compara un jacobiano analítico contra diferencias finitas del RHS.
+    analitico = np.asarray(jac(t, y), dtype=float)
+    return np.allclose(analitico, jacobiano_numerico(rhs, t, y), rtol=rtol, atol=atol)
+
+
+def rigidez(rhs, t_span, y0, jac=None):
+    # Autovalor más rápido del jacobiano en el punto inicial por la longitud
+    # del intervalo: aproxima cuántos pasos necesitaría RK45 por estabilidad.
+    t0, t1 = t_span
+    J = jac(t0, y0) if jac is not None else jacobiano_numerico(rhs, t0, y0)
+    autovalores = np.linalg.eigvals(np.asarray(J, dtype=float))
+    if not np.all(np.isfinite(autovalores)):
+        return np.inf
+    return np.abs(autovalores.real).max() * abs(t1 - t0)
+
+
+def elegir_metodo(rhs, t_span, y0, jac=None):
+    # LSODA cambia solo entre Adams y BDF, pero tarda en notar la rigidez
+    # cuando ya está al inicio; en ese caso se va directo a Radau.
+    if np.size(y0) > MAX_DIMENSION_DETECCION:
+        return 'LSODA'
+    try:
+        if rigidez(rhs, t_span, y0, jac) > UMBRAL_RIGIDEZ:
+            return 'Radau'
+    except (ArithmeticError, ValueError, np.linalg.LinAlgError):
+        pass
+    return 'LSODA'
+
+
+def _contador_pasos(opciones):
+    # solve_ivp evalúa cada evento una vez al inicio y una vez por paso. Con
+    # t_eval, sol.t ya no son los pasos, así que se cuentan con un evento
+    # que nunca cruza cero y se agrega al final de la lista del llamador.
+    conteo = [0]
+
+    def contar(t, y):
+        conteo[0] += 1
+        return 1.0
+
+    eventos = opciones.get('events')
+    if eventos is None:
+        eventos = []
+    elif callable(eventos):
+        eventos = [eventos]
+    opciones['events'] = [*eventos, contar]
+    return conteo, len(eventos)
+
+
+def resolver(rhs, t_span, y0, metodo='auto', precision=None, jac=None,
+             presupuesto=None, **opciones):
+    # Envoltorio de solve_ivp con la política común a todas las páginas:
+    # elección del método, tolerancias por nivel y presupuesto acotado. Los
+    # fallos se informan como ErrorSimulacion con un mensaje para el usuario.
+    y0 = np.asarray(y0, dtype=float)
+    if not np.all(np.isfinite(y0)) or not np.all(np.isfinite(t_span)):
+        raise ErrorSimulacion("Los valores iniciales y el tiempo deben ser números finitos.")
+
+    if metodo == 'auto':
+        metodo = elegir_metodo(rhs, t_span, y0, jac)
+    tolerancias = PRECISIONES[precision or PRECISION]
+    opciones = {**tolerancias, **opciones}
+    if jac is not None and metodo in ('Radau', 'BDF', 'LSODA'):
+        opciones['jac'] = jac
+
+    conteo = None
+    if opciones.get('t_eval') is not None:
+        conteo, n_eventos = _contador_pasos(opciones)
+
+    presupuesto = presupuesto or Presupuesto()
+    try:
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+            sol = integrate.solve_ivp(presupuesto.envolver(rhs), t_span, y0, method=metodo, **opciones)
+    except (ArithmeticError, ValueError) as e:
+        raise ErrorSimulacion(f"El integrador {metodo} no pudo avanzar: {e}") from e
+
+    if sol.status == -1:
+        raise ErrorSimulacion(
+            f"El integrador {metodo} falló en t = {sol.t[-1]:.4g}: {sol.message}"
+        )
+    if not np.all(np.isfinite(sol.y)):
+        raise ErrorSimulacion(
+            "La solución diverge (valores no finitos). Revise que los parámetros tengan sentido."
+        )
+    sol.metodo = metodo
+    if conteo is None:
+        sol.pasos = sol.t.size - 1
+    else:
+        sol.pasos = conteo[0] - 1
+        sol.t_events = sol.t_events[:-1] if n_eventos else None
+        sol.y_events = sol.y_events[:-1] if n_eventos else None
+    return sol
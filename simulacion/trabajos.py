@@ -0,0 +1,76 @@
+import os
+import time
+from contextlib import contextmanager
+
+import diskcache
+import psutil
+from dash import DiskcacheManager
+
+cache_trabajos = diskcache.Cache(os.environ.get('TRABAJOS_CACHE_DIR', './.cache-trabajos'))
+administrador = DiskcacheManager(cache_trabajos)
+
+MAX_TRABAJOS = int(os.environ.get('TRABAJOS_MAXIMO', 2))
+
+
+class LimiteTrabajos:
+    # Ranuras compartidas por todos los procesos a través de diskcache. Un
+    # trabajo cancelado muere sin liberar su ranura, por eso cada ranura
+    # guarda el pid dueño y expira sola después de `expira` segundos.
+    def __init__(self, cache, maximo, expira=900, espera=0.25):
+        self.cache = cache
+        self.maximo = maximo
+        self.expira = expira
+        self.espera = espera
+
+    @staticmethod
+    def _vivo(pid):
+        # pid_exists es verdadero para un zombi: el trabajo ya terminó pero
+        # nadie recogió su estado de salida.
+        try:
+            return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+        except psutil.NoSuchProcess:
+            return False
+
+    def _liberar_huerfanas(self):
+        for i in range(self.maximo):
+            clave = f'trabajo-ranura-{i}'
+            pid = self.cache.get(clave)
+            if pid is not None and not self._vivo(pid):
+                self.cache.delete(clave)
+
+    def _tomar(self):
+        for i in range(self.maximo):
+            clave = f'trabajo-ranura-{i}'
+            if self.cache.add(clave, os.getpid(), expire=self.expira):
+                return clave
+        return None
+
+    @contextmanager
+    def ranura(self, al_esperar=None):
+        clave = self._tomar()
+        while clave is None:
+            if al_esperar is not None:
+                al_esperar()
+            time.sleep(self.espera)
+            self._liberar_huerfanas()
+            clave = self._tomar()
+        try:
+            yield
+        finally:
+            self.cache.delete(clave)
+
+
+limite = LimiteTrabajos(cache_trabajos, MAX_TRABAJOS)
+
+
+def reportar_cada(set_progress, formato, paso=0.05):
+    # Devuelve progreso(fraccion) que solo llama a set_progress cuando la
+    # fracción avanzó al menos `paso`, para no saturar el cache de trabajos.
+    ultimo = [-1.0]
+
+    def progreso(fraccion):
+        if fraccion - ultimo[0] >= paso or fraccion >= 1:
+            ultimo[0] = fraccion
+            set_progress(formato.format(fraccion))
+
+    return progreso
@@ -0,0 +1,75 @@
+import os
+import re
+import sys
+import urllib.request
+
+from flask import request
+from flask_compress import Compress
+
+CARPETA_ASSETS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets')
+
+ICONOS_CDN = 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0'
+ICONOS_CARPETA = os.path.join(CARPETA_ASSETS, 'vendor', 'fontawesome')
+ICONOS_CSS = os.path.join(ICONOS_CARPETA, 'css', 'all.min.css')
+
+# Dash incluye solo los .css que estén dentro de assets/, así que con la copia
+# local ya no hace falta el <link> al CDN.
+ICONOS_LOCALES = os.path.exists(ICONOS_CSS)
+
+UN_ANO = 365 * 24 * 3600
+
+
+def instalar(app):
+    server = app.server
+
+    # Dash fija COMPRESS_ALGORITHM=['gzip'] cuando comprime él mismo; aquí se
+    # configura antes de inicializar flask-compress para habilitar brotli con
+    # un nivel bajo, que es lo que importa en respuestas generadas al vuelo.
+    server.config.update(
+        COMPRESS_ALGORITHM=['br', 'gzip'],
+        COMPRESS_BR_LEVEL=int(os.environ.get('COMPRESION_NIVEL_BR', 4)),
+        COMPRESS_LEVEL=int(os.environ.get('COMPRESION_NIVEL_GZIP', 6)),
+        COMPRESS_MIN_SIZE=int(os.environ.get('COMPRESION_MINIMO', 1024)),
+    )
+    Compress(server)
+
+    prefijo_assets = app.config.routes_pathname_prefix + app.config.assets_url_path.strip('/') + '/'
+
+    @server.after_request
+    def _cache_recursos(respuesta):
+        # Los assets llevan ?m=<mtime> y los bundles de componentes la versión
+        # en el nombre: cualquier cambio produce otra URL, así que el navegador
+        # puede guardarlos sin volver a preguntar.
+        if respuesta.status_code != 200:
+            return respuesta
+        if request.path.startswith(prefijo_assets) and 'm' in request.args:
+            respuesta.headers['Cache-Control'] = f'public, max-age={UN_ANO}, immutable'
+        elif f'max-age={UN_ANO}' in respuesta.headers.get('Cache-Control', ''):
+            respuesta.headers['Cache-Control'] = f'public, max-age={UN_ANO}, immutable'
+        return respuesta
+
+
+def descargar_iconos(base=ICONOS_CDN, destino=ICONOS_CARPETA):
+    # Copia la hoja de Font Awesome y las fuentes que referencia, respetando
+    # las rutas relativas (../webfonts/...) que usa el CSS.
+    os.makedirs(os.path.join(destino, 'css'), exist_ok=True)
+    os.makedirs(os.path.join(destino, 'webfonts'), exist_ok=True)
+
+    with urllib.request.urlopen(f'{base}/css/all.min.css') as r:
+        css = r.read()
+    with open(os.path.join(destino, 'css', 'all.min.css'), 'wb') as f:
+        f.write(css)
+
+    fuentes = sorted(set(re.findall(rb'url\(\.\./webfonts/([^)?#]+)', css)))
+    for fuente in fuentes:
+        nombre = fuente.decode()
+        with urllib.request.urlopen(f'{base}/webfonts/{nombre}') as r:
+            datos = r.read()
+        with open(os.path.join(destino, 'webfonts', nombre), 'wb') as f:
+            f.write(datos)
+    return fuentes
+
+
+if __name__ == '__main__':
+    for fuente in descargar_iconos(*sys.argv[1:2]):
+        print(fuente.decode())
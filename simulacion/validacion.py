@@ -0,0 +1,18 @@
+import math
+
+
+def revisar(positivos, no_negativos=None):
+    # Devuelve el mensaje del primer campo vacío o fuera de rango, o None si
+    # todos sirven. Se revisa antes de llegar a los núcleos compilados, que
+    # con None o valores sin sentido fallan con errores poco legibles.
+    no_negativos = no_negativos or {}
+    for nombre, valor in {**positivos, **no_negativos}.items():
+        if not isinstance(valor, (int, float)) or not math.isfinite(valor):
+            return f"Complete {nombre} con un número válido."
+    for nombre, valor in positivos.items():
+        if valor <= 0:
+            return f"{nombre} debe ser mayor que cero."
+    for nombre, valor in no_negativos.items():
+        if valor < 0:
+            return f"{nombre} no puede ser negativo."
+    return None
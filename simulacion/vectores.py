@@ -0,0 +1,88 @@
+import numpy as np
+
+
+def segmentos_flechas(X, Y, U, V):
+    # Cada flecha ocupa tres posiciones: cola, punta y un NaN que corta la
+    # línea, así todas las flechas caben en una sola traza.
+    x0 = np.ravel(X)
+    y0 = np.ravel(Y)
+    n = x0.size
+
+    xs = np.empty(3 * n)
+    ys = np.empty(3 * n)
+    xs[0::3] = x0
+    ys[0::3] = y0
+    xs[1::3] = x0 + np.ravel(U)
+    ys[1::3] = y0 + np.ravel(V)
+    xs[2::3] = np.nan
+    ys[2::3] = np.nan
+    return xs, ys
+
+
+def trazas_campo(X, Y, U, V, normalizar=False, longitud=1.0, colorear=False,
+                 escala_color='Viridis'):
+    U = np.broadcast_to(np.asarray(U, dtype=float), np.shape(X))
+    V = np.broadcast_to(np.asarray(V, dtype=float), np.shape(X))
+    magnitud = np.hypot(U, V)
+
+    if normalizar:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            factor = np.where(magnitud > 0, longitud / magnitud, 0.0)
+        U = U * factor
+        V = V * factor
+
+    xs, ys = segmentos_flechas(X, Y, U, V)
+
+    if not colorear:
+        # Colas y puntas van en trazas propias con color y tamaño escalares:
+        # un arreglo de colores por punto no viaja como arreglo tipado.
+        return [
+            dict(
+                type='scatter',
+                x=xs, y=ys,
+                mode='lines',
+                line=dict(color='blue', width=2),
+                hoverinfo='skip',
+                showlegend=False
+            ),
+            dict(
+                type='scatter',
+                x=xs[0::3], y=ys[0::3],
+                mode='markers',
+                marker=dict(size=3, color='blue'),
+                showlegend=False
+            ),
+            dict(
+                type='scatter',
+                x=xs[1::3], y=ys[1::3],
+                mode='markers',
+                marker=dict(size=6, color='red'),
+                showlegend=False
+            ),
+        ]
+
+    return [
+        dict(
+            type='scatter',
+            x=xs, y=ys,
+            mode='lines',
+            line=dict(color='lightslategray', width=1.5),
+            hoverinfo='skip',
+            showlegend=False
+        ),
+        dict(
+            type='scatter',
+            x=xs[1::3], y=ys[1::3],
+            mode='markers',
+            marker=dict(
+                size=6,
+                color=np.ravel(magnitud),
+                colorscale=escala_color,
+                showscale=True,
+                colorbar=dict(title='|F|')
+            ),
+            customdata=np.ravel(magnitud),
+            hovertemplate='|F|: %{customdata:.2f}<extra></extra>',
+            showlegend=False
+        ),
+    ]
@@ -0,0 +1,139 @@
+import os
+
+import dash
+from dash import dcc, html, Input, Output, State
+from dash.exceptions import PreventUpdate
+
+from simulacion.trabajos import cache_trabajos
+
+DEMORA_MS = int(os.environ.get('VIVO_DEMORA_MS', 150))
+
+# Solución de vista previa: tolerancias flojas y pocos puntos para responder
+# mientras el usuario arrastra; la definitiva llega después con los valores
+# por defecto de integrar_adaptativo.
+OPCIONES_PREVIA = dict(presupuesto=200, tolerancia=1e-2, precision='previa')
+
+_REBOTE = """
+async function(activo, ...valores) {
+    if (!activo || !activo.length) {
+        return window.dash_clientside.no_update;
+    }
+    const estado = window.simulacionVivo = window.simulacionVivo || {
+        sesion: Math.random().toString(36).slice(2),
+        turnos: {}
+    };
+    const turno = (estado.turnos['%(canal)s'] || 0) + 1;
+    estado.turnos['%(canal)s'] = turno;
+    await new Promise(resolver => setTimeout(resolver, %(demora)d));
+    if (estado.turnos['%(canal)s'] !== turno) {
+        return window.dash_clientside.no_update;
+    }
+    return {sesion: estado.sesion, secuencia: turno, valores: valores};
+}
+"""
+
+
+class Coalescedor:
+    # Guarda la última secuencia recibida por pestaña y canal. Está en el
+    # cache de trabajos para que todos los workers vean la misma: una
+    # petición vieja se descarta aunque la nueva haya caído en otro proceso.
+    def __init__(self, cache, expira=600):
+        self.cache = cache
+        self.expira = expira
+
+    def _clave(self, canal, datos):
+        return f"vivo-{canal}-{datos['sesion']}"
+
+    def recibir(self, canal, datos):
+        if not datos:
+            raise PreventUpdate
+        clave = self._clave(canal, datos)
+        with self.cache.transact():
+            if self.cache.get(clave, -1) > datos['secuencia']:
+                raise PreventUpdate
+            self.cache.set(clave, datos['secuencia'], expire=self.expira)
+        return datos['valores']
+
+    def vigente(self, canal, datos):
+        if not datos or self.cache.get(self._clave(canal, datos), -1) > datos['secuencia']:
+            raise PreventUpdate
+        return datos['valores']
+
+
+coalescedor = Coalescedor(cache_trabajos)
+
+
+def modo_vivo(canal, entradas):
+    # Interruptor "En vivo" y los Store que encadenan vista previa y
+    # refinamiento. Los valores de `entradas` se juntan en el navegador y
+    # solo viajan cuando dejan de cambiar durante DEMORA_MS.
+    id_activo = f'{canal}-vivo'
+    id_parametros = f'{canal}-vivo-parametros'
+
+    dash.clientside_callback(
+        _REBOTE % {'canal': canal, 'demora': DEMORA_MS},
+        Output(id_parametros, 'data'),
+        Input(id_activo, 'value'),
+        *[Input(entrada, 'value') for entrada in entradas],
+        prevent_initial_call=True,
+    )
+
+    return html.Div([
+        dcc.Checklist(
+            id=id_activo,
+            options=[{'label': ' En vivo', 'value': 'vivo'}],
+            value=[],
+        ),
+        dcc.Store(id=id_parametros),
+        dcc.Store(id=f'{canal}-vivo-refinar'),
+    ], className="input-group")
+
+
+_SINCRONIZAR = """
+function(deslizado, escrito, minimo, maximo) {
+    const origen = window.dash_clientside.callback_context.triggered.map(t => t.prop_id);
+    const no_update = window.dash_clientside.no_update;
+    if (origen.includes('%(id)s-deslizador.value')) {
+        return [no_update, deslizado];
+    }
+    if (typeof escrito !== 'number' || !isFinite(escrito)) {
+        return [no_update, no_update];
+    }
+    return [Math.min(Math.max(escrito, minimo), maximo), no_update];
+}
+"""
+
+_sincronizados = set()
+
+
+def deslizador(identificador, minimo, maximo, paso, valor):
+    # El valor vive en el campo numérico `identificador`, que es el que leen
+    # los callbacks y no tiene límites; el deslizador solo es una forma
+    # rápida de recorrer el rango habitual y se mantiene sincronizado.
+    id_deslizador = f'{identificador}-deslizador'
+
+    # Varias páginas reutilizan el mismo id con otro rango: el callback se
+    # registra una sola vez y toma los límites del deslizador que está en
+    # pantalla.
+    if identificador not in _sincronizados:
+        _sincronizados.add(identificador)
+        dash.clientside_callback(
+            _SINCRONIZAR % {'id': identificador},
+            Output(id_deslizador, 'value'),
+            Output(identificador, 'value'),
+            Input(id_deslizador, 'value'),
+            Input(identificador, 'value'),
+            State(id_deslizador, 'min'),
+            State(id_deslizador, 'max'),
+            prevent_initial_call=True,
+        )
+
+    return html.Div([
+        dcc.Input(id=identificador, type='number', value=valor, debounce=True,
+                  className="input-field"),
+        dcc.Slider(
+            id=id_deslizador, min=minimo, max=maximo, step=paso, value=valor,
+            marks=None, updatemode='drag',
+            tooltip={'placement': 'bottom', 'always_visible': True},
+        ),
+    ])
@@ -0,0 +1,20 @@
+import pytest
+
+
+# Compartido por tests/conftest.py y benchmarks/conftest.py.
+@pytest.fixture(scope='session')
+def paginas():
+    # Las páginas llaman a dash.register_page al importarse, así que primero
+    # hay que crear la aplicación.
+    import app  # noqa: F401
+    from pages import (campovectorial, depredadorpresa1, depredadorpresa2,
+                       modeloseir, modelosir, pagina3, pract1)
+    return {
+        'campovectorial': campovectorial,
+        'depredadorpresa1': depredadorpresa1,
+        'depredadorpresa2': depredadorpresa2,
+        'modeloseir': modeloseir,
+        'modelosir': modelosir,
+        'pagina3': pagina3,
+        'pract1': pract1,
+    }
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from simulacion.analitico import resumen_sir
+from simulacion.lotes import integrar_sir_lote
+
+
+def numerico(N, beta, gamma, I0, t_max=2000):
+    t, S, I, R = integrar_sir_lote(beta, gamma, N - I0, I0, 0, (0, t_max),
+                                   t_eval=np.linspace(0, t_max, 20001), N=N,
+                                   rtol=1e-9, atol=1e-9)
+    return {'pico': I[0].max(), 'dia_pico': t[I[0].argmax()], 'tamano_final': N - S[0, -1]}
+
+
+def test_sin_infectados_no_hay_epidemia():
+    resumen = resumen_sir(1000, 0.3, 0.1, 0)
+    assert resumen['tamano_final'] == 0
+    assert resumen['pico'] == 0
+    assert resumen['dia_pico'] == 0
+
+
+def test_r0_menor_que_uno_no_hay_pico():
+    resumen = resumen_sir(1000, 0.05, 0.1, 10)
+    assert resumen['R0'] == pytest.approx(0.5)
+    assert resumen['pico'] == 10
+    assert resumen['dia_pico'] == 0
+    assert resumen['tamano_final'] == pytest.approx(numerico(1000, 0.05, 0.1, 10)['tamano_final'], rel=1e-4)
+
+
+@pytest.mark.parametrize('beta, gamma', [(0.3, 0.1), (1.0, 0.2), (0.15, 0.1)])
+def test_coincide_con_la_integracion(beta, gamma):
+    resumen = resumen_sir(1000, beta, gamma, 1)
+    esperado = numerico(1000, beta, gamma, 1)
+    assert resumen['pico'] == pytest.approx(esperado['pico'], rel=1e-4)
+    assert resumen['tamano_final'] == pytest.approx(esperado['tamano_final'], rel=1e-4)
+    assert resumen['dia_pico'] == pytest.approx(esperado['dia_pico'], abs=0.5)
+
+
+def test_acepta_arreglos():
+    resumen = resumen_sir(1000, np.array([0.3, 0.3]), 0.1, np.array([0, 1]))
+    assert resumen['tamano_final'][0] == 0
+    assert resumen['tamano_final'][1] > 900
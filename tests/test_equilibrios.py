@@ -0,0 +1,50 @@
+import pytest
+
+from simulacion import equilibrios
+
+ESTABLE = (0.25, 10, 0.5, 0.33, 0.2, 3.5, 0.1)
+# Foco interior inestable con un ciclo límite de período ≈ 181.3 días
+# (medido integrando la órbita con rtol=1e-9).
+CICLICO = (0.25, 1000, 2.0, 0.33, 0.2, 3.5, 0.15)
+
+
+@pytest.fixture
+def analizar_gilpin(paginas):
+    return paginas['depredadorpresa1'].analizar_gilpin
+
+
+def tipos(analisis):
+    return [equilibrio['tipo'] for equilibrio in analisis['equilibrios']]
+
+
+def test_equilibrios_del_caso_por_defecto(analizar_gilpin):
+    analisis = analizar_gilpin.__wrapped__(*ESTABLE)
+    assert tipos(analisis) == ['silla', 'foco estable', 'silla']
+    x, y = analisis['equilibrios'][1]['punto']
+    assert x == pytest.approx(3.5**0.5, rel=1e-6)
+    assert analisis['ciclo'] is None
+    assert analisis['completo']
+
+
+def test_encuentra_el_ciclo_limite(analizar_gilpin, monkeypatch):
+    # Con un tope holgado el resultado no depende de la velocidad de la
+    # máquina que corre los tests.
+    monkeypatch.setattr(equilibrios, 'LIMITE_CICLO_SEGUNDOS', 5.0)
+    analisis = analizar_gilpin.__wrapped__(*CICLICO)
+    assert tipos(analisis) == ['silla', 'foco inestable', 'silla']
+    assert analisis['completo']
+    assert analisis['ciclo'] is not None
+    assert analisis['ciclo']['periodo'] == pytest.approx(181.3, rel=1e-2)
+
+
+def test_no_memoriza_una_busqueda_cortada_por_tiempo(analizar_gilpin, monkeypatch):
+    from simulacion.cache import cache
+
+    cache.limpiar()
+    monkeypatch.setattr(equilibrios, 'LIMITE_CICLO_SEGUNDOS', 1e-9)
+    cortado = analizar_gilpin(*CICLICO)
+    assert not cortado['completo'] and cortado['ciclo'] is None
+
+    monkeypatch.setattr(equilibrios, 'LIMITE_CICLO_SEGUNDOS', 5.0)
+    assert analizar_gilpin(*CICLICO)['ciclo'] is not None
+    cache.limpiar()
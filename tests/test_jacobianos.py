@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from simulacion.solucionador import verificar_jacobiano
+
+GILPIN = (0.25, 10.0, 0.5, 0.33, 0.2, 3.5, 0.1)
+
+# (página, campo, jacobiano, parámetros, estados de prueba)
+CASOS = {
+    'sir': ('modelosir', 'modelo_sir', 'jacobiano_sir', (0.3, 0.1, 1000.0),
+            [[990.0, 10.0, 0.0], [500.0, 300.0, 200.0], [50.0, 5.0, 945.0]]),
+    'seir': ('modeloseir', 'modelo_seir', 'jacobiano_seir', (0.5, 0.2, 0.1, 1000.0),
+             [[980.0, 10.0, 10.0, 0.0], [400.0, 150.0, 250.0, 200.0], [30.0, 2.0, 8.0, 960.0]]),
+    'gilpin-ayala': ('depredadorpresa1', 'modelo_rumor', 'jacobiano_rumor', GILPIN,
+                     [[4.0, 1.0], [0.3, 2.5], [9.5, 0.2], [1.87, 1.61]]),
+    # Los puntos con A o B negativos están en la zona recortada: ahí el
+    # campo no depende de esa variable y su columna debe ser cero.
+    'gilpin-ayala-truncado': ('depredadorpresa2', 'sistema_continuo', 'jacobiano_continuo', GILPIN,
+                              [[4.0, 1.0], [0.3, 2.5], [-0.5, 1.0], [4.0, -0.2], [-1.0, -1.0]]),
+}
+
+
+@pytest.mark.parametrize('caso', CASOS)
+def test_jacobiano_coincide_con_diferencias_finitas(paginas, caso):
+    pagina, campo, jacobiano, args, estados = CASOS[caso]
+    campo = getattr(paginas[pagina], campo)
+    jacobiano = getattr(paginas[pagina], jacobiano)
+
+    def rhs(t, y):
+        return campo(y, t, *args)
+
+    def jac(t, y):
+        return jacobiano(y, t, *args)
+
+    for y in estados:
+        assert verificar_jacobiano(rhs, jac, 0.0, np.array(y)), y
+
+
+@pytest.mark.parametrize('y, columnas', [
+    ([-0.5, 1.0], [0]),
+    ([4.0, -0.2], [1]),
+    ([-1.0, -1.0], [0, 1]),
+])
+def test_jacobiano_continuo_anula_columnas_recortadas(paginas, y, columnas):
+    J = np.asarray(paginas['depredadorpresa2'].jacobiano_continuo(np.array(y), 0.0, *GILPIN))
+    assert np.all(J[:, columnas] == 0)
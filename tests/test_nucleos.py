@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from simulacion import nucleos
+
+# Función de referencia de cada núcleo: (página, nombre).
+REFERENCIAS = {
+    'sir': ('modelosir', 'modelo_sir'),
+    'seir': ('modeloseir', 'modelo_seir'),
+    'gilpin-ayala': ('depredadorpresa1', 'modelo_rumor'),
+    'gilpin-ayala-truncado': ('depredadorpresa2', 'sistema_continuo'),
+    'sir-jacobiano': ('modelosir', 'jacobiano_sir'),
+    'seir-jacobiano': ('modeloseir', 'jacobiano_seir'),
+    'gilpin-ayala-jacobiano': ('depredadorpresa1', 'jacobiano_rumor'),
+    'gilpin-ayala-truncado-jacobiano': ('depredadorpresa2', 'jacobiano_continuo'),
+}
+
+
+def referencia(paginas, nombre):
+    pagina, funcion = REFERENCIAS[nombre]
+    return getattr(paginas[pagina], funcion)
+
+
+def puntos(nombre, n=25, semilla=0):
+    # Perturba la muestra de nucleos.MUESTRAS; los núcleos truncados también
+    # se prueban con A o B negativos.
+    y, args = nucleos.MUESTRAS[nombre]
+    rng = np.random.default_rng(semilla)
+    minimo = -1.0 if 'truncado' in nombre else 0.05
+    for _ in range(n):
+        yield (np.array(y) * rng.uniform(minimo, 2.0, len(y)),
+               tuple(np.array(args) * rng.uniform(0.5, 1.5, len(args))))
+
+
+def test_todos_los_nucleos_tienen_referencia_y_muestra():
+    assert set(nucleos.NUCLEOS) == set(REFERENCIAS) == set(nucleos.MUESTRAS)
+
+
+@pytest.mark.parametrize('nombre', REFERENCIAS)
+def test_nucleo_python_coincide_con_la_pagina(paginas, nombre):
+    funcion = nucleos.NUCLEOS[nombre]
+    for y, args in puntos(nombre):
+        np.testing.assert_allclose(
+            funcion(y, 0.0, *args),
+            np.asarray(referencia(paginas, nombre)(y, 0.0, *args), dtype=float),
+            rtol=1e-12, atol=1e-15,
+        )
+
+
+@pytest.mark.parametrize('nombre', REFERENCIAS)
+def test_nucleo_compilado_coincide_con_la_pagina(paginas, nombre):
+    pytest.importorskip('numba')
+    compilado = nucleos.compilar(nombre)
+    for y, args in puntos(nombre):
+        np.testing.assert_allclose(
+            compilado(y, 0.0, *args),
+            np.asarray(referencia(paginas, nombre)(y, 0.0, *args), dtype=float),
+            rtol=1e-12, atol=1e-15,
+        )
+
+
+@pytest.mark.parametrize('nombre', REFERENCIAS)
+def test_nucleo_compilado_acepta_enteros_sin_recompilar(nombre):
+    # Los dcc.Input entregan int para valores como N=1000 o K=10.
+    pytest.importorskip('numba')
+    compilado = nucleos.compilar(nombre)
+    y, args = nucleos.MUESTRAS[nombre]
+    mixtos = tuple(int(a) if float(a).is_integer() else a for a in args)
+
+    np.testing.assert_array_equal(
+        compilado(np.array(y), 0, *mixtos),
+        compilado(np.array(y), 0.0, *args),
+    )
+    assert len(compilado.signatures) == 1
@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+from scipy.integrate import odeint
+
+CICLICO = (0.25, 1000, 2.0, 0.33, 0.2, 3.5, 0.15)
+
+
+def test_gilpin_con_k_grande_coincide_con_odeint(paginas):
+    # Con las tolerancias de solve_ivp por defecto esta órbita llegaba a
+    # A ≈ -3e16; la referencia es odeint, que es lo que usaba la página.
+    pagina = paginas['depredadorpresa1']
+    t, (A, B) = pagina.resolver_gilpin.__wrapped__(*CICLICO, 4, 1, 2000)
+    referencia = odeint(pagina.modelo_rumor, [4, 1], np.linspace(0, 2000, 20001), args=CICLICO)
+
+    assert A.min() > 0 and B.min() > 0
+    assert A.max() == pytest.approx(referencia[:, 0].max(), rel=1e-3)
+    assert B.max() == pytest.approx(referencia[:, 1].max(), rel=1e-2)